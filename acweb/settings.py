@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +53,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Agrupa las invalidaciones de caché de cada petición en una sola publicación
+    "cms.middleware.CoalesceInvalidationMiddleware",
 ]
 
 ROOT_URLCONF = "acweb.urls"
@@ -87,6 +90,18 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Caché en disco compartida por todos los workers (portada y versiones de contenido)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache",
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -127,10 +142,71 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"  # Para producción
 
+# Con CMS_STATIC_MANIFEST=1 (por defecto cuando DEBUG=False) collectstatic
+# genera nombres con hash, minifica CSS/JS y escribe .gz/.br, y {% static %}
+# exige el manifest: requiere ejecutar collectstatic antes de levantar el sitio.
+# Sin él (desarrollo, tests) se usan los nombres originales de assets/
+CMS_STATIC_MANIFEST = os.environ.get("CMS_STATIC_MANIFEST", "0" if DEBUG else "1") == "1"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "cms.storage.CompressedManifestStaticFilesStorage" if CMS_STATIC_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
 # Media files (Archivos subidos por usuarios)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Ingesta de imágenes del CMS: lado máximo (px), peso máximo tras optimizar
+# y tamaño máximo de la imagen original antes de decodificarla
+CMS_IMAGE_MAX_DIMENSION = 2560
+CMS_IMAGE_MAX_BYTES = 2 * 1024 * 1024
+CMS_IMAGE_MAX_SOURCE_PIXELS = 50_000_000
+
+# Imágenes configuradas por URL (logos): se descargan a media/ y se re-validan
+# con If-None-Match/If-Modified-Since (manage.py fetch_remote_images)
+CMS_REMOTE_IMAGE_REFRESH = 60 * 60 * 24  # segundos entre re-validaciones
+CMS_REMOTE_IMAGE_TIMEOUT = 10
+CMS_REMOTE_IMAGE_MAX_BYTES = 10 * 1024 * 1024
+# Solo se descargan imágenes de direcciones públicas (también tras cada
+# redirección); estos hosts quedan exentos, ej. ["127.0.0.1"] para pruebas
+CMS_REMOTE_IMAGE_ALLOWED_HOSTS = []
+
+# Identificador del deploy (ej. el commit) incluido en las claves de la portada
+# y en el ETag; si está vacío se usa un hash de las plantillas y del manifest
+CMS_BUILD_ID = os.environ.get("CMS_BUILD_ID", "")
+
+# Tras cada publicación la portada se re-renderiza en segundo plano; mientras
+# tanto los visitantes reciben la versión anterior (stale-while-revalidate)
+CMS_WARM_INDEX = True
+
+# Sin caché, la portada se envía por partes (<head> primero) para adelantar
+# la descarga de estilos y de la imagen del hero. Un error en una sección
+# posterior corta la conexión; con False se renderiza completa antes de
+# responder y cualquier error es un 500
+CMS_STREAM_INDEX = True
+
+# Si la base de datos falla (bloqueada, caída) se sirve la última portada
+# renderizada, marcada con X-Cache: STALE, si no tiene más de estos segundos
+CMS_STALE_IF_ERROR = 60 * 60 * 24
+
+# Exportación estática de la portada (manage.py export_static)
+# Si CMS_STATIC_EXPORT_ROOT está definido, la portada se re-exporta al guardar contenido
+CMS_STATIC_EXPORT_ROOT = None  # ej: BASE_DIR / "public"
+CMS_STATIC_EXPORT_URL = "http://localhost:8000"
+
+# Distribución "Free for Web" de Font Awesome 6 (carpetas css/ y webfonts/).
+# Con fontTools instalado la portada usa un subconjunto local de la fuente
+# (manage.py build_icons); si no está definida se usa el CDN
+CMS_FONTAWESOME_ROOT = None  # ej: BASE_DIR / "vendor" / "fontawesome-free-6.5.2-web"
+
 # Configuración de autenticación
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'panel-admin'
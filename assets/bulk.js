@@ -0,0 +1,18 @@
+// Acciones masivas en las listas del panel: marcar todas y confirmar eliminaciones
+const form = document.querySelector('form[data-bulk]');
+
+if (form) {
+  const boxes = () => form.querySelectorAll('input[name=pk]');
+
+  form.querySelector('[data-select-all]').addEventListener('change', (e) => {
+    boxes().forEach((box) => { box.checked = e.target.checked; });
+  });
+
+  form.addEventListener('submit', (e) => {
+    const count = form.querySelectorAll('input[name=pk]:checked').length;
+    const action = form.elements.action.value;
+    if (action === 'delete' && !window.confirm(`¿Eliminar ${count} fila(s)? Esta acción no se puede deshacer.`)) {
+      e.preventDefault();
+    }
+  });
+}
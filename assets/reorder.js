@@ -0,0 +1,56 @@
+// Arrastrar y soltar filas en las listas del panel (ver cms/ordering.py)
+// Solo se envía la fila movida y sus nuevas vecinas: el servidor calcula la clave
+const body = document.querySelector('[data-reorder-url]');
+
+if (body) {
+  const csrf = document.querySelector('[name=csrfmiddlewaretoken]').value;
+  let dragged = null;
+  let origin = null;
+
+  body.addEventListener('dragstart', (e) => {
+    dragged = e.target.closest('tr[data-pk]');
+    if (!dragged) return;
+    origin = dragged.nextElementSibling;
+    e.dataTransfer.effectAllowed = 'move';
+    dragged.classList.add('opacity-50');
+  });
+
+  body.addEventListener('dragover', (e) => {
+    const row = e.target.closest('tr[data-pk]');
+    if (!dragged || !row || row === dragged) return;
+    e.preventDefault();
+    const box = row.getBoundingClientRect();
+    const below = e.clientY > box.top + box.height / 2;
+    body.insertBefore(dragged, below ? row.nextElementSibling : row);
+  });
+
+  body.addEventListener('drop', (e) => e.preventDefault());
+
+  body.addEventListener('dragend', async () => {
+    const row = dragged;
+    dragged = null;
+    if (!row) return;
+    row.classList.remove('opacity-50');
+    if (row.nextElementSibling === origin) return;
+
+    const data = new FormData();
+    data.append('pk', row.dataset.pk);
+    const previous = row.previousElementSibling;
+    const next = row.nextElementSibling;
+    if (previous) data.append('previous', previous.dataset.pk);
+    if (next) data.append('next', next.dataset.pk);
+
+    const response = await fetch(body.dataset.reorderUrl, {
+      method: 'POST',
+      body: data,
+      headers: { 'X-CSRFToken': csrf },
+    });
+    if (!response.ok) {
+      // Otro editor cambió la lista o la fila ya no existe: mostrar el estado real
+      window.location.reload();
+      return;
+    }
+    const { order } = await response.json();
+    row.querySelector('[data-order]').textContent = order;
+  });
+}
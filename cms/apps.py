@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CmsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cms"
+
+    def ready(self):
+        # Registrar señales de invalidación de caché
+        from . import signals  # noqa: F401
@@ -0,0 +1,70 @@
+"""
+Acciones masivas del panel de AC Technology
+Cada acción es una sola sentencia UPDATE o DELETE y una sola publicación
+"""
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .invalidation import schedule_publish
+from .models import Counter, Service
+
+
+# Acción -> (etiqueta, valores del UPDATE o None para eliminar)
+BULK_ACTIONS = {
+    'activate': ('Activar', {'active': True}),
+    'deactivate': ('Desactivar', {'active': False}),
+    'feature': ('Destacar', {'featured': True}),
+    'unfeature': ('Quitar destacado', {'featured': False}),
+    'delete': ('Eliminar', None),
+}
+
+
+def bulk_actions(model):
+    """Acciones disponibles para el modelo (solo las de campos que tiene)"""
+    names = {field.name for field in model._meta.get_fields()}
+    return {
+        action: label
+        for action, (label, values) in BULK_ACTIONS.items()
+        if values is None or set(values) <= names
+    }
+
+
+def _delete(model, pks):
+    """DELETE ... WHERE id IN (...) sin cargar las filas ni enviar post_delete
+
+    Ninguna tabla referencia a servicios, marcas ni proyectos: no hay cascada.
+    """
+    using = router.db_for_write(model)
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', list(pks))
+        return cursor.rowcount
+
+
+def run_bulk_action(model, action, pks):
+    """Aplica la acción a las filas pks en una transacción
+
+    Retorna el número de filas afectadas. Las señales por fila no se
+    disparan: la portada se publica una sola vez al confirmar.
+    """
+    if action not in bulk_actions(model):
+        raise ValueError(f'Acción no válida: {action}')
+    pks = sorted(set(pks))
+    if not pks:
+        return 0
+
+    values = BULK_ACTIONS[action][1]
+    with transaction.atomic():
+        if values is None:
+            count = _delete(model, pks)
+            if count:
+                Counter.adjust(model, -count)
+        else:
+            count = model.objects.filter(pk__in=pks).update(**values, updated_at=timezone.now())
+        if count:
+            # Borrar servicios puede dejar íconos sin uso en la fuente
+            schedule_publish((model,), icons=values is None and model is Service)
+    return count
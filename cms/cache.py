@@ -0,0 +1,208 @@
+"""
+Caché de la página pública de AC Technology
+Versiona el contenido publicado y guarda la portada ya renderizada
+"""
+import functools
+import hashlib
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from . import locks
+
+
+CONTENT_VERSION_KEY = 'cms:content-version'
+CONFIG_VERSION_KEY = 'cms:config-version'
+LAST_MODIFIED_KEY = 'cms:last-modified'
+MODEL_VERSION_KEY = 'cms:model-version:{model}'
+INDEX_PAGE_KEY = 'cms:index:{build}:{version}:{scheme}:{host}'
+INDEX_PAGE_TIMEOUT = 60 * 60 * 24
+# Última portada renderizada de cada dominio por este build, de cualquier generación
+INDEX_STALE_KEY = 'cms:index-stale:{build}:{scheme}:{host}'
+# Antigüedad máxima (segundos) de la portada servida si falla la base de datos
+STALE_IF_ERROR = getattr(settings, 'CMS_STALE_IF_ERROR', 60 * 60 * 24)
+# Un solo worker renderiza la portada de un dominio a la vez (cms.locks)
+INDEX_LOCK_KEY = 'index-{scheme}-{host}'
+# Dominios con portada cacheada, para el precalentamiento
+INDEX_ORIGINS_KEY = 'cms:index-origins'
+# Filas editadas recientemente (dashboard), por versión del modelo
+RECENT_KEY = 'cms:recent:{build}:{model}:{limit}:{version}'
+
+
+# ========== BUILD ==========
+@functools.cache
+def get_build_id():
+    """Identificador del código desplegado (uno por proceso)
+
+    CMS_BUILD_ID si está definido (ej. el commit del deploy); si no, un hash
+    de las plantillas del CMS y del manifest de collectstatic. Forma parte de
+    las claves de la portada, de los fragmentos y del ETag: la caché en disco
+    sobrevive a los reinicios y sin él, tras un deploy, se serviría HTML
+    viejo que apunta a estáticos con hash que ya no existen.
+    """
+    configured = getattr(settings, 'CMS_BUILD_ID', '')
+    if configured:
+        return str(configured)
+    directories = [*settings.TEMPLATES[0]['DIRS'], Path(apps.get_app_config('cms').path) / 'templates']
+    paths = sorted(path for directory in directories for path in Path(directory).rglob('*.html'))
+    if settings.STATIC_ROOT:
+        paths.append(Path(settings.STATIC_ROOT) / 'staticfiles.json')
+    digest = hashlib.sha256()
+    for path in paths:
+        if path.is_file():
+            digest.update(str(path).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+# ========== VERSIÓN DEL CONTENIDO ==========
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Caché vacía o expulsada: arrancar una generación nueva
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_content_version():
+    """Retorna la generación actual del contenido (compartida entre workers)"""
+    return _get_version(CONTENT_VERSION_KEY)
+
+
+def bump_content_version():
+    """Invalida todo lo cacheado a partir del contenido publicado"""
+    cache.set(CONTENT_VERSION_KEY, time.time_ns(), None)
+
+
+def get_config_version():
+    """Retorna la versión de los singletons de configuración"""
+    return _get_version(CONFIG_VERSION_KEY)
+
+
+def bump_config_version():
+    """Obliga a todos los workers a recargar los singletons"""
+    cache.set(CONFIG_VERSION_KEY, time.time_ns(), None)
+
+
+def get_model_versions(labels):
+    """Versión de cada modelo (label -> versión) en una sola lectura de caché"""
+    keys = {MODEL_VERSION_KEY.format(model=label): label for label in labels}
+    found = cache.get_many(keys)
+    return {
+        label: found[key] if key in found else _get_version(key)
+        for key, label in keys.items()
+    }
+
+
+def bump_model_versions(labels):
+    """Invalida los fragmentos que leen alguno de estos modelos"""
+    version = time.time_ns()
+    cache.set_many({MODEL_VERSION_KEY.format(model=label): version for label in labels}, None)
+
+
+def content_etag(version):
+    """ETag fuerte de una generación de contenido renderizada por este build"""
+    return f'{get_build_id()}-{version:x}'
+
+
+def get_content_etag():
+    """ETag fuerte de la portada: cambia con cada generación y con cada deploy"""
+    return content_etag(get_content_version())
+
+
+def get_last_modified():
+    """Fecha de la última modificación del contenido publicado o None"""
+    return cache.get(LAST_MODIFIED_KEY)
+
+
+def set_last_modified(value):
+    """Guarda la fecha de la última modificación del contenido publicado"""
+    cache.set(LAST_MODIFIED_KEY, value, None)
+
+
+# ========== PORTADA RENDERIZADA ==========
+def _origin_key(template, request):
+    return template.format(build=get_build_id(), scheme=request.scheme, host=request.get_host())
+
+
+def index_page_key(request, version=None):
+    """Clave de la portada para una generación (por defecto la actual)"""
+    return INDEX_PAGE_KEY.format(
+        build=get_build_id(),
+        version=version or get_content_version(),
+        scheme=request.scheme,
+        host=request.get_host(),
+    )
+
+
+def get_index_page(request):
+    """Retorna el HTML cacheado de la portada o None"""
+    return cache.get(index_page_key(request))
+
+
+def set_index_page(request, content, version=None):
+    """Guarda el HTML de la portada renderizado para la generación dada
+
+    version debe leerse antes de renderizar: si el contenido cambia durante
+    el render, la página queda bajo la generación anterior y no la nueva.
+    """
+    version = version or get_content_version()
+    cache.set(index_page_key(request, version), content, INDEX_PAGE_TIMEOUT)
+    cache.set(_origin_key(INDEX_STALE_KEY, request), {
+        'version': version,
+        'content': content,
+        'last_modified': get_last_modified(),
+        'rendered_at': time.time(),
+    }, max(INDEX_PAGE_TIMEOUT, STALE_IF_ERROR))
+
+    origin = f'{request.scheme}://{request.get_host()}'
+    origins = cache.get(INDEX_ORIGINS_KEY, set())
+    if origin not in origins:
+        cache.set(INDEX_ORIGINS_KEY, origins | {origin}, None)
+
+
+def get_stale_index_page(request, max_age=None):
+    """Última portada renderizada del dominio o None
+
+    dict con version, content, last_modified y rendered_at. Con max_age se
+    descarta si fue renderizada hace más de esos segundos.
+    """
+    stale = cache.get(_origin_key(INDEX_STALE_KEY, request))
+    if stale is None or (max_age is not None and time.time() - stale.get('rendered_at', 0) > max_age):
+        return None
+    return stale
+
+
+def get_index_origins():
+    """Dominios (scheme://host) que tienen portada cacheada"""
+    return sorted(cache.get(INDEX_ORIGINS_KEY, set()))
+
+
+def acquire_index_lock(request):
+    """True si este worker obtuvo el derecho a renderizar la portada"""
+    return locks.acquire(_origin_key(INDEX_LOCK_KEY, request))
+
+
+def release_index_lock(request):
+    locks.release(_origin_key(INDEX_LOCK_KEY, request))
+
+
+# ========== EDITADOS RECIENTEMENTE ==========
+def get_recent(model, limit=5):
+    """Últimas filas actualizadas del modelo, cacheadas hasta que cambie
+
+    La clave incluye la versión del modelo: publicar contenido la invalida
+    sin borrar nada.
+    """
+    label = model._meta.label_lower
+    version = get_model_versions([label])[label]
+    key = RECENT_KEY.format(build=get_build_id(), model=label, limit=limit, version=version)
+    items = cache.get(key)
+    if items is None:
+        items = list(model.objects.order_by('-updated_at', '-pk')[:limit])
+        cache.set(key, items, INDEX_PAGE_TIMEOUT)
+    return items
@@ -0,0 +1,171 @@
+"""
+Exportación estática de la portada de AC Technology
+Pre-renderiza index.html con el contenido publicado para servirlo desde nginx
+"""
+import gzip
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit, unquote
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import HttpRequest
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se generan .gz
+    brotli = None
+
+
+# Tipos de archivo que vale la pena precomprimir
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.txt', '.xml'}
+
+# Atributos src/href y srcset/imagesrcset del HTML renderizado
+URL_ATTR_RE = re.compile(r'''\b(?:src|href)=["']([^"']+)["']''')
+SRCSET_ATTR_RE = re.compile(r'''\b(?:srcset|imagesrcset)=["']([^"']+)["']''')
+
+# url(...) de las hojas de estilos (fuentes de la hoja de íconos)
+CSS_URL_RE = re.compile(r'''url\(\s*["']?([^"')]+?)["']?\s*\)''')
+
+
+class ExportRequest(HttpRequest):
+    """Petición sintética para renderizar la portada fuera de un servidor"""
+
+    def __init__(self, base_url):
+        super().__init__()
+        url = urlsplit(base_url)
+        self._export_scheme = url.scheme or 'http'
+        self._export_host = url.netloc or 'localhost'
+        self.path = self.path_info = '/'
+        self.method = 'GET'
+
+    def _get_scheme(self):
+        return self._export_scheme
+
+    def get_host(self):
+        # Host fijo del sitio exportado (no se valida contra ALLOWED_HOSTS)
+        return self._export_host
+
+
+def write_file(path, content):
+    """Escribe un archivo de forma atómica y sus variantes precomprimidas"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(path, content)
+    written = [path]
+    if path.suffix in COMPRESSIBLE_EXTENSIONS:
+        gz_path = path.with_name(path.name + '.gz')
+        _write_atomic(gz_path, gzip.compress(content, compresslevel=9, mtime=0))
+        written.append(gz_path)
+        if brotli is not None:
+            br_path = path.with_name(path.name + '.br')
+            _write_atomic(br_path, brotli.compress(content))
+            written.append(br_path)
+    return written
+
+
+def _write_atomic(path, content):
+    # nginx nunca debe leer un archivo a medio escribir
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.export-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def _static_roots():
+    """Directorios de donde puede salir un archivo estático"""
+    roots = [settings.STATIC_ROOT]
+    for finder in finders.get_finders():
+        roots.extend(storage.location for storage in getattr(finder, 'storages', {}).values())
+    return [Path(root).resolve() for root in roots if root]
+
+
+def _within(path, roots):
+    return any(path.is_relative_to(root) for root in roots)
+
+
+def _find_source(url, host):
+    """Retorna el archivo local de una URL de static/media o None
+
+    Solo se aceptan URLs relativas o del host exportado, y solo archivos que
+    queden dentro de MEDIA_ROOT o de los directorios de estáticos una vez
+    resuelta la ruta: /media/../db.sqlite3 no debe terminar publicado.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('', 'http', 'https') or parts.netloc not in ('', host):
+        return None
+    path = unquote(parts.path)
+    if path.startswith(settings.MEDIA_URL):
+        source = Path(settings.MEDIA_ROOT) / path[len(settings.MEDIA_URL):].lstrip('/')
+        roots = [Path(settings.MEDIA_ROOT).resolve()]
+    elif path.startswith(settings.STATIC_URL):
+        name = path[len(settings.STATIC_URL):]
+        try:
+            # Primero lo recolectado (nombres con hash), luego los directorios fuente
+            if staticfiles_storage.exists(name):
+                found = staticfiles_storage.path(name)
+            else:
+                found = finders.find(name)
+        except SuspiciousFileOperation:
+            return None
+        if not found:
+            return None
+        source, roots = Path(found), _static_roots()
+    else:
+        return None
+    source = source.resolve()
+    return source if source.is_file() and _within(source, roots) else None
+
+
+def referenced_urls(html):
+    """URLs referenciadas por el HTML, incluidas las candidatas de srcset"""
+    urls = set(URL_ATTR_RE.findall(html))
+    for srcset in SRCSET_ATTR_RE.findall(html):
+        urls.update(candidate.split()[0] for candidate in srcset.split(',') if candidate.strip())
+    return sorted(urls)
+
+
+def stylesheet_urls(url, css):
+    """URLs locales referenciadas por una hoja de estilos, resueltas contra su URL"""
+    return sorted({
+        urljoin(url, ref) for ref in CSS_URL_RE.findall(css)
+        if not ref.startswith(('data:', 'http:', 'https:', '//', '#'))
+    })
+
+
+def export_site(output_dir, base_url=None):
+    """Exporta la portada, sus versiones comprimidas y los archivos referenciados"""
+    from .views import render_index
+
+    output_dir = Path(output_dir)
+    base_url = base_url or getattr(settings, 'CMS_STATIC_EXPORT_URL', 'http://localhost')
+    request = ExportRequest(base_url)
+    html = render_index(request)
+
+    written = write_file(output_dir / 'index.html', html.encode('utf-8'))
+    output_root = output_dir.resolve()
+    pending, seen = referenced_urls(html), set()
+    while pending:
+        url = pending.pop()
+        if url in seen:
+            continue
+        seen.add(url)
+        source = _find_source(url, request.get_host())
+        if source is None:
+            continue
+        target = (output_root / unquote(urlsplit(url).path).lstrip('/')).resolve()
+        if not _within(target, [output_root]):
+            continue
+        if source.suffix == '.css':
+            pending.extend(stylesheet_urls(url, source.read_text(encoding='utf-8')))
+        # Los archivos ya exportados y sin cambios no se vuelven a copiar
+        if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+            continue
+        written.extend(write_file(target, source.read_bytes()))
+        shutil.copystat(source, target)
+    return written
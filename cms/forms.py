@@ -3,10 +3,33 @@ Formularios para el CMS de AC Technology
 """
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
 from .models import (
     User, SiteConfig, HeroSection, Service, Partner,
     Showroom, Project, ContactInfo, SEOConfig
 )
+from .images import normalize_upload
+
+
+# ========== INGESTA DE IMÁGENES ==========
+class ImageIngestMixin:
+    """Normaliza las imágenes subidas antes de guardarlas
+
+    Reduce las que superan el tamaño máximo, elimina los metadatos EXIF y las
+    re-codifica con una calidad razonable (ver cms.images.normalize_upload).
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, field in self.fields.items():
+            value = cleaned_data.get(name)
+            if isinstance(field, forms.ImageField) and isinstance(value, UploadedFile):
+                try:
+                    cleaned_data[name] = normalize_upload(value)
+                except ValidationError as e:
+                    self.add_error(name, e)
+        return cleaned_data
 
 
 # ========== FORMULARIOS DE USUARIO ==========
@@ -58,7 +81,7 @@ class SiteConfigForm(forms.ModelForm):
         }
 
 
-class HeroSectionForm(forms.ModelForm):
+class HeroSectionForm(ImageIngestMixin, forms.ModelForm):
     """Formulario para la secci�n Hero"""
     class Meta:
         model = HeroSection
@@ -76,7 +99,7 @@ class HeroSectionForm(forms.ModelForm):
         }
 
 
-class ServiceForm(forms.ModelForm):
+class ServiceForm(ImageIngestMixin, forms.ModelForm):
     """Formulario para servicios"""
     class Meta:
         model = Service
@@ -94,7 +117,7 @@ class ServiceForm(forms.ModelForm):
         }
 
 
-class PartnerForm(forms.ModelForm):
+class PartnerForm(ImageIngestMixin, forms.ModelForm):
     """Formulario para marcas aliadas"""
     class Meta:
         model = Partner
@@ -109,7 +132,7 @@ class PartnerForm(forms.ModelForm):
         }
 
 
-class ShowroomForm(forms.ModelForm):
+class ShowroomForm(ImageIngestMixin, forms.ModelForm):
     """Formulario para Showroom"""
     class Meta:
         model = Showroom
@@ -122,7 +145,7 @@ class ShowroomForm(forms.ModelForm):
         }
 
 
-class ProjectForm(forms.ModelForm):
+class ProjectForm(ImageIngestMixin, forms.ModelForm):
     """Formulario para proyectos"""
     class Meta:
         model = Project
@@ -157,7 +180,7 @@ class ContactInfoForm(forms.ModelForm):
         }
 
 
-class SEOConfigForm(forms.ModelForm):
+class SEOConfigForm(ImageIngestMixin, forms.ModelForm):
     """Formulario para configuracion SEO"""
     class Meta:
         model = SEOConfig
@@ -0,0 +1,174 @@
+"""
+Fuente de íconos del sitio de AC Technology
+Genera un subconjunto de Font Awesome con solo los íconos que usa la portada
+"""
+import hashlib
+import io
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+from .models import SiteConfig, HeroSection, Service
+
+try:
+    from fontTools import subset
+except ImportError:  # fontTools es opcional: sin él la portada usa el CDN
+    subset = None
+
+try:
+    import brotli
+except ImportError:  # sin brotli fontTools no puede escribir WOFF2
+    brotli = None
+
+
+# Plantillas cuyos íconos fijos (redes sociales, WhatsApp...) se incluyen
+ICON_TEMPLATES = ('cms/templates/cms/index/*.html',)
+
+# Estilo -> (familia, peso, archivo de webfonts/ sin extensión)
+FONT_STYLES = {
+    'solid': ('Font Awesome 6 Free', 900, 'fa-solid-900'),
+    'regular': ('Font Awesome 6 Free', 400, 'fa-regular-400'),
+    'brands': ('Font Awesome 6 Brands', 400, 'fa-brands-400'),
+}
+STYLE_CLASSES = {
+    'fa-solid': 'solid', 'fas': 'solid',
+    'fa-regular': 'regular', 'far': 'regular',
+    'fa-brands': 'brands', 'fab': 'brands',
+}
+
+CLASS_ATTR_RE = re.compile(r'class="([^"]*)"')
+# .fa-bolt::before { content: "\f0e7"; } (también agrupados y minificados)
+GLYPH_RULE_RE = re.compile(r'((?:\.fa-[a-z0-9-]+::?before\s*,?\s*)+)\{\s*content:\s*"\\([0-9a-fA-F]+)"')
+GLYPH_NAME_RE = re.compile(r'\.(fa-[a-z0-9-]+)::?before')
+
+ICON_SET_KEY = 'cms:icon-set'
+
+
+# ========== ÍCONOS EN USO ==========
+def parse_icon_classes(value):
+    """'fa-brands fa-whatsapp text-2xl' -> {('brands', 'fa-whatsapp')}"""
+    classes = value.split()
+    style = next((STYLE_CLASSES[c] for c in classes if c in STYLE_CLASSES), 'solid')
+    return {(style, c) for c in classes if c.startswith('fa-') and c not in STYLE_CLASSES}
+
+
+def icons_in_use():
+    """Íconos de los servicios, los CTA del hero y las plantillas de la portada"""
+    values = list(Service.objects.values_list('icon', flat=True))
+    hero = HeroSection.objects.filter(pk=1).first() or HeroSection()
+    values += [hero.cta1_icon, hero.cta2_icon]
+    for pattern in ICON_TEMPLATES:
+        for path in Path(settings.BASE_DIR).glob(pattern):
+            values += CLASS_ATTR_RE.findall(path.read_text(encoding='utf-8'))
+
+    icons = set()
+    for value in values:
+        icons |= parse_icon_classes(value)
+    return icons
+
+
+# ========== SUBCONJUNTO DE LA FUENTE ==========
+def glyph_map(root):
+    """Nombre de clase -> código del glifo, leído del CSS de Font Awesome"""
+    css_path = _first_existing(Path(root) / 'css' / 'all.min.css', Path(root) / 'css' / 'all.css')
+    glyphs = {}
+    for selectors, codepoint in GLYPH_RULE_RE.findall(css_path.read_text(encoding='utf-8')):
+        for name in GLYPH_NAME_RE.findall(selectors):
+            glyphs[name] = int(codepoint, 16)
+    return glyphs
+
+
+def subset_font(path, codepoints):
+    """Retorna (contenido, extensión) de la fuente reducida a los códigos dados"""
+    options = subset.Options()
+    options.flavor = 'woff2' if brotli is not None else 'woff'
+    options.layout_features = []
+    options.notdef_outline = True
+    font = subset.load_font(str(path), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    return buffer.getvalue(), options.flavor
+
+
+def _first_existing(*paths):
+    for path in paths:
+        if path.exists():
+            return path
+    raise FileNotFoundError(f'No existe {paths[0]}')
+
+
+def _font_source(root, stem):
+    webfonts = Path(root) / 'webfonts'
+    return _first_existing(webfonts / f'{stem}.ttf', webfonts / f'{stem}.woff2')
+
+
+def icon_css(glyphs_by_style, font_urls):
+    """Hoja mínima: @font-face de cada estilo usado y una regla por ícono"""
+    rules = []
+    for style, (family, weight, _) in FONT_STYLES.items():
+        if style in font_urls:
+            url, flavor = font_urls[style]
+            rules.append(
+                f'@font-face{{font-family:"{family}";font-style:normal;font-weight:{weight};'
+                f'font-display:block;src:url({url}) format("{flavor}")}}'
+            )
+    rules.append(
+        '.fa-solid,.fa-regular,.fa-brands,.fas,.far,.fab{-moz-osx-font-smoothing:grayscale;'
+        '-webkit-font-smoothing:antialiased;display:inline-block;font-style:normal;'
+        'font-variant:normal;line-height:1;text-rendering:auto}'
+    )
+    for style, (family, weight, _) in FONT_STYLES.items():
+        selector = ','.join(c for c, s in STYLE_CLASSES.items() if s == style)
+        rules.append(f'{selector}{{font-family:"{family}";font-weight:{weight}}}')
+
+    names = {}
+    for glyphs in glyphs_by_style.values():
+        names.update(glyphs)
+    rules.extend(f'.{name}::before{{content:"\\{codepoint:x}"}}' for name, codepoint in sorted(names.items()))
+    return '\n'.join(rules) + '\n'
+
+
+def publish_icons(force=False):
+    """Genera la fuente y la hoja de íconos y la asigna a SiteConfig
+
+    Retorna True si cambió la hoja referenciada. No hace nada si no están
+    configurados CMS_FONTAWESOME_ROOT y fontTools.
+    """
+    root = getattr(settings, 'CMS_FONTAWESOME_ROOT', None)
+    if subset is None or not root:
+        return False
+
+    site_config = SiteConfig.load()
+    icons = icons_in_use()
+    fingerprint = hashlib.sha256(repr((str(root), sorted(icons))).encode()).hexdigest()
+    if not force and site_config.icon_stylesheet and cache.get(ICON_SET_KEY) == fingerprint:
+        return False
+
+    glyphs = glyph_map(root)
+    glyphs_by_style = {}
+    for style, name in icons:
+        if name in glyphs:
+            glyphs_by_style.setdefault(style, {})[name] = glyphs[name]
+
+    field_file = site_config.icon_stylesheet
+    font_urls = {}
+    for style, style_glyphs in glyphs_by_style.items():
+        stem = FONT_STYLES[style][2]
+        content, flavor = subset_font(_font_source(root, stem), set(style_glyphs.values()))
+        # Junto a la hoja de estilos: la URL relativa sirve también en la exportación
+        name = field_file.storage.save(f'icons/{stem}.{flavor}', ContentFile(content))
+        font_urls[style] = (Path(name).name, flavor)
+
+    previous = field_file.name
+    field_file.save('icons.css', ContentFile(icon_css(glyphs_by_style, font_urls).encode()), save=False)
+    cache.set(ICON_SET_KEY, fingerprint, None)
+    if field_file.name == previous:
+        return False
+    SiteConfig.objects.filter(pk=site_config.pk).update(icon_stylesheet=field_file.name)
+    return True
@@ -0,0 +1,330 @@
+"""
+Procesamiento de imágenes del CMS de AC Technology
+Normaliza las subidas y genera variantes responsive (AVIF/WebP + JPEG/PNG)
+"""
+import base64
+import hashlib
+import io
+import json
+from pathlib import PurePosixPath
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import models
+from PIL import Image, ImageOps, features
+
+
+# Anchos generados para srcset (nunca se amplía la imagen original)
+VARIANT_WIDTHS = (480, 800, 1200, 1600)
+
+# Formatos modernos en orden de preferencia para <picture>
+MODERN_FORMATS = tuple(
+    fmt for fmt in ('avif', 'webp') if features.check(fmt)
+)
+
+FORMAT_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 60},
+    'webp': {'format': 'WEBP', 'quality': 78, 'method': 6},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+
+# Imágenes que se sirven tal cual (sin srcset): íconos y Open Graph
+UNVARIED_IMAGE_FIELDS = {
+    'cms.SEOConfig.og_image',
+    'cms.SEOConfig.favicon',
+    'cms.SEOConfig.apple_touch_icon',
+    'cms.SEOConfig.schema_organization_logo_file',
+}
+
+# Lado máximo del placeholder LQIP (px)
+PLACEHOLDER_SIZE = 16
+
+# Versión de la política de derivados: cambia al tocar anchos, formatos o
+# calidades y obliga a regenerar (manage.py regenerate_images)
+POLICY_VERSION = hashlib.sha256(json.dumps(
+    [VARIANT_WIDTHS, MODERN_FORMATS, FORMAT_OPTIONS, sorted(UNVARIED_IMAGE_FIELDS), PLACEHOLDER_SIZE],
+    sort_keys=True,
+).encode()).hexdigest()[:12]
+
+MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+
+
+# Límites de ingesta (configurables en settings.py)
+MAX_DIMENSION = getattr(settings, 'CMS_IMAGE_MAX_DIMENSION', 2560)
+MAX_BYTES = getattr(settings, 'CMS_IMAGE_MAX_BYTES', 2 * 1024 * 1024)
+MAX_SOURCE_PIXELS = getattr(settings, 'CMS_IMAGE_MAX_SOURCE_PIXELS', 50_000_000)
+
+# Calidades probadas en orden hasta entrar en el presupuesto de bytes
+INGEST_QUALITIES = (85, 75, 65, 55)
+
+# Formatos que se re-codifican al subir (el resto solo se valida)
+INGEST_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+
+
+# ========== NORMALIZACIÓN DE SUBIDAS ==========
+def _encode_upload(img, fmt, quality, icc_profile):
+    buffer = io.BytesIO()
+    options = {'format': fmt}
+    if icc_profile:
+        options['icc_profile'] = icc_profile
+    if fmt == 'JPEG':
+        options.update(quality=quality, optimize=True, progressive=True)
+    elif fmt == 'WEBP':
+        options.update(quality=quality, method=6)
+    else:
+        options.update(optimize=True)
+    img.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def normalize_upload(upload):
+    """Reduce, limpia metadatos y re-codifica una imagen subida
+
+    Retorna un archivo nuevo listo para guardarse o el original si su formato
+    no se re-codifica (GIF animados, ICO...). Lanza ValidationError si la
+    imagen es demasiado grande para procesarla o no entra en MAX_BYTES.
+    """
+    upload.seek(0)
+    with Image.open(upload) as source:
+        # Solo se leyó la cabecera: rechazar antes de decodificar
+        width, height = source.size
+        if width * height > MAX_SOURCE_PIXELS:
+            raise ValidationError(
+                'La imagen es demasiado grande (%(pixels)s MP). Máximo: %(max)s MP.',
+                params={'pixels': width * height // 1_000_000, 'max': MAX_SOURCE_PIXELS // 1_000_000},
+            )
+        fmt = source.format
+        if fmt not in INGEST_FORMATS or getattr(source, 'n_frames', 1) > 1:
+            upload.seek(0)
+            return upload
+
+        icc_profile = source.info.get('icc_profile')
+        # thumbnail() usa draft(): los JPEG se decodifican ya reducidos
+        # (1/2, 1/4, 1/8) y la memoria queda acotada por MAX_DIMENSION
+        source.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+        # Aplicar la rotación EXIF antes de descartar los metadatos
+        img = ImageOps.exif_transpose(source)
+
+    for key in ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment', 'photoshop'):
+        img.info.pop(key, None)
+
+    if fmt == 'JPEG' and img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    name = upload.name
+    content = None
+    for quality in INGEST_QUALITIES:
+        content = _encode_upload(img, fmt, quality, icc_profile)
+        if len(content) <= MAX_BYTES or fmt == 'PNG':
+            break
+
+    if len(content) > MAX_BYTES and fmt == 'PNG' and not _has_alpha(img):
+        # PNG fotográfico sin transparencia: JPEG es mucho más liviano
+        fmt, name = 'JPEG', str(PurePosixPath(name).with_suffix('.jpg'))
+        img = img.convert('RGB')
+        for quality in INGEST_QUALITIES:
+            content = _encode_upload(img, fmt, quality, icc_profile)
+            if len(content) <= MAX_BYTES:
+                break
+
+    if len(content) > MAX_BYTES:
+        raise ValidationError(
+            'La imagen pesa %(size)s KB después de optimizarla. Máximo: %(max)s KB.',
+            params={'size': len(content) // 1024, 'max': MAX_BYTES // 1024},
+        )
+    return SimpleUploadedFile(name, content, content_type=Image.MIME[fmt])
+
+
+# ========== CAMPOS CON METADATOS ==========
+def meta_field_name(field_name):
+    """Nombre del JSONField que acompaña a un ImageField"""
+    return f'{field_name}_meta'
+
+
+def image_fields(model):
+    """ImageFields del modelo que tienen un campo <nombre>_meta asociado"""
+    names = {f.name for f in model._meta.get_fields()}
+    return [
+        f for f in model._meta.get_fields()
+        if isinstance(f, models.ImageField) and meta_field_name(f.name) in names
+    ]
+
+
+def image_meta(instance, field_name):
+    """Metadatos guardados de una imagen (dict vacío si no hay)"""
+    return getattr(instance, meta_field_name(field_name), None) or {}
+
+
+# ========== GENERACIÓN DE VARIANTES ==========
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def _variant_widths(width):
+    """Anchos a generar para una imagen del ancho dado"""
+    widths = [w for w in VARIANT_WIDTHS if w < width]
+    widths.append(min(width, VARIANT_WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def _encode(img, fmt):
+    options = dict(FORMAT_OPTIONS[fmt])
+    if fmt == 'jpeg' and img.mode != 'RGB':
+        img = img.convert('RGB')
+    buffer = io.BytesIO()
+    img.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def _variant_name(source_name, width, fmt):
+    path = PurePosixPath(source_name)
+    return str(path.parent / 'variants' / f'{path.stem}-{width}w.{fmt}')
+
+
+def delete_variants(storage, meta):
+    """Elimina del storage las variantes registradas en los metadatos"""
+    if getattr(storage, 'content_addressed', False):
+        # Archivos deduplicados: otra imagen idéntica puede compartirlos
+        return
+    for variant in meta.get('variants', []):
+        if storage.exists(variant['name']):
+            storage.delete(variant['name'])
+
+
+def _open_image(data):
+    """Abre la imagen ya rotada según su orientación EXIF"""
+    with Image.open(io.BytesIO(data)) as source:
+        img = ImageOps.exif_transpose(source)
+        img.load()
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if _has_alpha(img) else 'RGB')
+    return img
+
+
+def _read(field_file):
+    with field_file.open('rb') as f:
+        return f.read()
+
+
+def is_current(meta, data):
+    """True si los metadatos corresponden a este archivo y a la política actual"""
+    return (
+        meta.get('policy') == POLICY_VERSION
+        and meta.get('hash') == hashlib.sha256(data).hexdigest()
+    )
+
+
+def _dominant_color(img):
+    """Color predominante en formato #rrggbb"""
+    small = img.convert('RGB')
+    small.thumbnail((64, 64))
+    palette = small.quantize(colors=8)
+    count, index = max(palette.getcolors())
+    r, g, b = palette.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def _placeholder(img):
+    """Miniatura LQIP como data URI (unos cientos de bytes)"""
+    small = img.copy()
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    fmt = 'webp' if 'webp' in MODERN_FORMATS else ('png' if _has_alpha(small) else 'jpeg')
+    buffer = io.BytesIO()
+    small.save(buffer, format=fmt.upper(), quality=40)
+    return f'data:{MIME_TYPES[fmt]};base64,{base64.b64encode(buffer.getvalue()).decode()}'
+
+
+def build_variants(field_file, img):
+    """Genera las variantes de una imagen
+
+    Cada variante queda en <carpeta>/variants/<nombre>-<ancho>w.<formato>.
+    """
+    storage = field_file.storage
+    fallback = 'png' if _has_alpha(img) else 'jpeg'
+
+    variants = []
+    for width in _variant_widths(img.width):
+        height = round(img.height * width / img.width)
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+        for fmt in MODERN_FORMATS + (fallback,):
+            name = _variant_name(field_file.name, width, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            name = storage.save(name, ContentFile(_encode(resized, fmt)))
+            variants.append({'name': name, 'format': fmt, 'width': width, 'height': height})
+
+    return {'fallback': fallback, 'variants': variants}
+
+
+def build_image_meta(field, field_file, data=None):
+    """Calcula los metadatos persistidos de una imagen
+
+    Dimensiones, color predominante y placeholder para todas; además
+    variantes responsive salvo para las que se sirven tal cual.
+    """
+    if data is None:
+        data = _read(field_file)
+    img = _open_image(data)
+    meta = {
+        'source': field_file.name,
+        'hash': hashlib.sha256(data).hexdigest(),
+        'policy': POLICY_VERSION,
+        'width': img.width,
+        'height': img.height,
+        'color': _dominant_color(img),
+        'placeholder': _placeholder(img),
+    }
+    if str(field) not in UNVARIED_IMAGE_FIELDS:
+        meta.update(build_variants(field_file, img))
+    return meta
+
+
+def process_instance_images(instance, force=False):
+    """Actualiza los metadatos de todas las imágenes de una instancia
+
+    Retorna los campos <nombre>_meta que cambiaron.
+    """
+    changed = {}
+    for field in image_fields(type(instance)):
+        field_file = getattr(instance, field.name)
+        meta = image_meta(instance, field.name)
+        if not field_file:
+            if meta:
+                delete_variants(field.storage, meta)
+                changed[meta_field_name(field.name)] = {}
+            continue
+        if not force and meta.get('source') == field_file.name and meta.get('policy') == POLICY_VERSION:
+            continue
+        if meta:
+            delete_variants(field_file.storage, meta)
+        changed[meta_field_name(field.name)] = build_image_meta(field, field_file)
+
+    for name, value in changed.items():
+        setattr(instance, name, value)
+    return changed
+
+
+def regenerate_image(field_label, name, meta, force=False):
+    """Regenera los derivados de un archivo (apto para un pool de procesos)
+
+    Solo toca el storage, nunca la base de datos: retorna los metadatos
+    nuevos o None si el archivo y la política no cambiaron.
+    """
+    app_label, model_name, field_name = field_label.split('.')
+    field = apps.get_model(app_label, model_name)._meta.get_field(field_name)
+    field_file = field.attr_class(None, field, name)
+    data = _read(field_file)
+    if not force and is_current(meta, data):
+        return None
+    if meta:
+        delete_variants(field.storage, meta)
+    return build_image_meta(field, field_file, data)
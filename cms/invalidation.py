@@ -0,0 +1,86 @@
+"""
+Invalidación agrupada del CMS de AC Technology
+Junta los cambios de una transacción o de una petición en una sola publicación
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.db import DatabaseError, transaction
+
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+class PendingPublish:
+    """Cambios acumulados que aún no se publicaron"""
+
+    def __init__(self):
+        self.models = []
+        self.config_changed = False
+        self.icons = False
+
+    def add(self, models, config_changed, icons):
+        self.models.extend(model for model in models if model not in self.models)
+        self.config_changed |= config_changed
+        self.icons |= icons
+
+
+def schedule_publish(models=(), config_changed=False, icons=False):
+    """Registra un cambio de contenido; se publica una vez por lote
+
+    Dentro de coalesce() se publica al salir del bloque; si no, al confirmar
+    la transacción actual (o enseguida, en modo autocommit).
+    """
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        pending = _state.pending = PendingPublish()
+    pending.add(models, config_changed, icons)
+    if not getattr(_state, 'depth', 0):
+        # Un callback por cambio: el primero publica todo y el resto no hace
+        # nada. Si la transacción se revierte, lo acumulado sale en el
+        # siguiente lote (invalidar de más no rompe nada)
+        transaction.on_commit(flush)
+
+
+def flush():
+    """Publica los cambios acumulados en este hilo, si hay
+
+    Si la publicación falla por la base de datos, los cambios quedan
+    pendientes y se reintentan con el próximo lote o al terminar la próxima
+    petición de este hilo: el guardado ya se confirmó y no debe ser un 500.
+    """
+    pending = getattr(_state, 'pending', None)
+    # Se vacía antes de publicar: lo que se guarde al publicar va a otro lote
+    _state.pending = None
+    if pending is None:
+        return
+    # Importación diferida: signals importa las vistas, que importan este módulo
+    from .signals import publish_content, publish_site_icons
+    try:
+        # Primero la fuente de íconos: el snapshot ya referencia la hoja nueva
+        if pending.icons:
+            publish_site_icons()
+        if pending.models:
+            publish_content(pending.config_changed, models=tuple(pending.models))
+    except DatabaseError:
+        logger.exception('No se pudo publicar la portada; se reintentará')
+        current = getattr(_state, 'pending', None)
+        if current is None:
+            _state.pending = pending
+        else:
+            current.add(pending.models, pending.config_changed, pending.icons)
+
+
+@contextmanager
+def coalesce():
+    """Agrupa todas las publicaciones del bloque en una sola al salir"""
+    _state.depth = getattr(_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+        if not _state.depth and getattr(_state, 'pending', None) is not None:
+            transaction.on_commit(flush)
@@ -0,0 +1,71 @@
+"""
+Locks entre procesos del CMS de AC Technology
+Un archivo por lock bloqueado con flock (LockFileEx en Windows): la caché en
+disco no tiene un add() atómico y el sistema libera el lock si el proceso muere
+"""
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import locks
+
+
+# Archivos abiertos de los locks que tiene este proceso (nombre -> archivo)
+_held = {}
+_held_guard = threading.Lock()
+
+
+def lock_dir():
+    """Directorio de los archivos de lock, compartido por todos los workers
+
+    CMS_LOCK_DIR o, con la caché en disco, una carpeta dentro de ella
+    (FileBasedCache.clear() solo borra sus propios .djcache).
+    """
+    configured = getattr(settings, 'CMS_LOCK_DIR', None)
+    if configured:
+        return Path(configured)
+    cache_config = settings.CACHES['default']
+    if cache_config['BACKEND'].endswith('FileBasedCache'):
+        return Path(cache_config['LOCATION']) / 'locks'
+    return Path(tempfile.gettempdir()) / 'acweb-locks'
+
+
+def _lock_path(name):
+    return lock_dir() / (re.sub(r'[^A-Za-z0-9_.-]', '_', name) + '.lock')
+
+
+def acquire(name):
+    """True si este worker obtuvo el lock; no espera si otro ya lo tiene"""
+    path = _lock_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # El archivo no se borra nunca: borrarlo permitiría dos dueños a la vez
+    lock_file = open(path, 'ab')
+    if not locks.lock(lock_file, locks.LOCK_EX | locks.LOCK_NB):
+        lock_file.close()
+        return False
+    with _held_guard:
+        _held[name] = lock_file
+    return True
+
+
+def release(name):
+    """Libera un lock obtenido con acquire(); sin efecto si no se tiene"""
+    with _held_guard:
+        lock_file = _held.pop(name, None)
+    if lock_file is not None:
+        locks.unlock(lock_file)
+        lock_file.close()
+
+
+@contextmanager
+def single_flight(name):
+    """Bloque que ejecuta un solo worker a la vez; produce True si es este"""
+    acquired = acquire(name)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            release(name)
@@ -0,0 +1,37 @@
+"""
+Comando para generar la hoja de estilos utilitaria a partir de las plantillas
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.utility_css import build_stylesheet, collect_candidates, unresolved_classes
+
+
+class Command(BaseCommand):
+    help = 'Genera assets/utilities.css con las clases utilitarias usadas en cms/templates/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=settings.BASE_DIR / 'assets' / 'utilities.css',
+            help='Archivo de salida (por defecto assets/utilities.css)',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Falla si alguna clase con forma de utilitaria no se puede generar',
+        )
+
+    def handle(self, *args, **options):
+        css, classes = build_stylesheet(collect_candidates())
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            f.write(css)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(classes)} clases, {len(css.encode()) // 1024} KB en {options["output"]}'
+        ))
+
+        unresolved = unresolved_classes()
+        for name, files in unresolved.items():
+            self.stderr.write(self.style.WARNING(f'Clase sin generar: {name} ({", ".join(files)})'))
+        if unresolved and options['strict']:
+            raise CommandError(f'{len(unresolved)} clases sin generar')
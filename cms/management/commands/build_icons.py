@@ -0,0 +1,32 @@
+"""
+Comando para generar el subconjunto local de Font Awesome
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.icons import publish_icons, icons_in_use, subset
+from cms.signals import publish_content
+
+
+class Command(BaseCommand):
+    help = 'Genera la fuente y la hoja de íconos con solo los íconos que usa la portada'
+
+    def handle(self, *args, **options):
+        if subset is None:
+            raise CommandError('fontTools no está instalado (pip install fonttools brotli).')
+        if not getattr(settings, 'CMS_FONTAWESOME_ROOT', None):
+            raise CommandError('Configura CMS_FONTAWESOME_ROOT con la carpeta de Font Awesome.')
+
+        try:
+            changed = publish_icons(force=True)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for style, name in sorted(icons_in_use()):
+            self.stdout.write(f'  {style:8} {name}')
+        if changed:
+            # Nueva hoja: republicar la portada con la configuración recargada
+            publish_content(config_changed=True)
+            self.stdout.write(self.style.SUCCESS('Hoja de íconos actualizada'))
+        else:
+            self.stdout.write('Sin cambios en los íconos')
@@ -0,0 +1,35 @@
+"""
+Comando para exportar la portada como sitio estático
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.export import export_site, brotli
+
+
+class Command(BaseCommand):
+    help = 'Pre-renderiza la portada (index.html, .gz/.br y archivos referenciados) en un directorio'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=getattr(settings, 'CMS_STATIC_EXPORT_ROOT', None),
+            help='Directorio de salida (por defecto CMS_STATIC_EXPORT_ROOT)',
+        )
+        parser.add_argument(
+            '--base-url',
+            default=getattr(settings, 'CMS_STATIC_EXPORT_URL', 'http://localhost'),
+            help='URL pública del sitio (por defecto CMS_STATIC_EXPORT_URL)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError('Indica --output o configura CMS_STATIC_EXPORT_ROOT.')
+
+        if brotli is None:
+            self.stdout.write(self.style.WARNING('brotli no está instalado: solo se generan archivos .gz'))
+
+        written = export_site(options['output'], options['base_url'])
+        for path in written:
+            self.stdout.write(f'  {path}')
+        self.stdout.write(self.style.SUCCESS(f'{len(written)} archivos exportados en {options["output"]}'))
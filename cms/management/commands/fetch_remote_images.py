@@ -0,0 +1,41 @@
+"""
+Comando para descargar y re-validar las imágenes configuradas por URL
+"""
+from django.core.management.base import BaseCommand
+
+from cms.remote_images import localize, remote_image_fields, remote_image_models
+from cms.signals import publish_content
+
+
+class Command(BaseCommand):
+    help = (
+        'Descarga a media/ los logos configurados por URL y re-valida las copias con '
+        'If-None-Match/If-Modified-Since. Pensado para ejecutarse periódicamente (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Descargar de nuevo sin petición condicional aunque no haya vencido el intervalo',
+        )
+
+    def handle(self, *args, **options):
+        updated = 0
+        for model in remote_image_models():
+            fields = remote_image_fields(model)
+            for pk in model.objects.values_list('pk', flat=True):
+                if localize(model, pk, force=options['force']):
+                    updated += 1
+                instance = model.objects.get(pk=pk)
+                for url_field, file_field, state_field in fields:
+                    state = getattr(instance, state_field) or {}
+                    if not state:
+                        continue
+                    status = self.style.ERROR(state['error']) if state.get('error') else getattr(instance, file_field).name
+                    self.stdout.write(f'  {model.__name__} #{pk} {state.get("url")}: {status}')
+
+        if updated:
+            # Una sola republicación para todas las copias nuevas
+            publish_content(config_changed=True)
+        self.stdout.write(self.style.SUCCESS(f'{updated} registros con imágenes nuevas'))
@@ -0,0 +1,91 @@
+"""
+Comando para regenerar en paralelo los derivados de todas las imágenes
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from cms.images import image_fields, meta_field_name, regenerate_image
+
+
+class Command(BaseCommand):
+    help = (
+        'Regenera variantes, dimensiones y placeholders de todas las imágenes del CMS. '
+        'Es idempotente: omite las imágenes cuyo hash y política no cambiaron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Procesos en paralelo (por defecto, uno por CPU)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerar aunque el archivo y la política no hayan cambiado',
+        )
+
+    def collect_tasks(self):
+        """(modelo, pk, campo, archivo, metadatos) de cada imagen existente"""
+        tasks = []
+        for model in apps.get_app_config('cms').get_models():
+            for field in image_fields(model):
+                meta_name = meta_field_name(field.name)
+                rows = model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                for pk, name, meta in rows.values_list('pk', field.name, meta_name).iterator():
+                    tasks.append((model, pk, field, name, meta or {}))
+        return tasks
+
+    def handle(self, *args, **options):
+        tasks = self.collect_tasks()
+        total = len(tasks)
+        self.stdout.write(f'{total} imágenes encontradas, {options["workers"]} procesos')
+        if not total:
+            return
+
+        # Los procesos hijos no deben heredar conexiones abiertas
+        connections.close_all()
+        updated = skipped = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+            futures = {
+                pool.submit(regenerate_image, str(field), name, meta, options['force']): (model, pk, field, name)
+                for model, pk, field, name, meta in tasks
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                model, pk, field, name = futures[future]
+                try:
+                    meta = future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'\n  {field} #{pk} ({name}): {exc}')
+                else:
+                    if meta is None:
+                        skipped += 1
+                    else:
+                        # Se guarda cada resultado al llegar: si se interrumpe,
+                        # la siguiente ejecución retoma donde quedó
+                        model.objects.filter(pk=pk, **{field.name: name}).update(
+                            **{meta_field_name(field.name): meta}
+                        )
+                        updated += 1
+                self.stdout.write(
+                    f'\r  [{done}/{total}] {done * 100 // total}% '
+                    f'({updated} regeneradas, {skipped} sin cambios, {failed} con error)',
+                    ending='',
+                )
+                self.stdout.flush()
+        self.stdout.write('')
+
+        if updated:
+            # update() no dispara señales: republicar la portada una sola vez
+            from cms.signals import publish_content
+            publish_content(config_changed=True)
+
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f'{updated} regeneradas, {skipped} sin cambios, {failed} con error'))
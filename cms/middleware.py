@@ -0,0 +1,19 @@
+"""
+Middleware del CMS de AC Technology
+"""
+from .invalidation import coalesce
+
+
+class CoalesceInvalidationMiddleware:
+    """Publica la portada una sola vez por petición
+
+    Guardar una lista editable del admin, o varios formularios en la misma
+    petición, genera una invalidación y un precalentamiento en total.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with coalesce():
+            return self.get_response(request)
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:45
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0002_seoconfig"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HomepageSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="Contenido serializado",
+                    ),
+                ),
+                (
+                    "published_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Publicado"),
+                ),
+            ],
+            options={
+                "verbose_name": "Snapshot de la portada",
+                "verbose_name_plural": "Snapshot de la portada",
+            },
+        ),
+    ]
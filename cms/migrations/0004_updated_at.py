@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0003_homepagesnapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contactinfo",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="herosection",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="homepagesnapshot",
+            name="last_modified",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Última modificación del contenido"
+            ),
+        ),
+        migrations.AddField(
+            model_name="partner",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="showroom",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="siteconfig",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
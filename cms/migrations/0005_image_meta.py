@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0004_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="herosection",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Variantes de la imagen",
+            ),
+        ),
+        migrations.AddField(
+            model_name="partner",
+            name="logo_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Variantes de el logo",
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Variantes de la imagen",
+            ),
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Variantes de la imagen",
+            ),
+        ),
+        migrations.AddField(
+            model_name="showroom",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Variantes de la imagen",
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0005_image_meta"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seoconfig",
+            name="apple_touch_icon_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos del Apple Touch Icon",
+            ),
+        ),
+        migrations.AddField(
+            model_name="seoconfig",
+            name="favicon_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos del favicon",
+            ),
+        ),
+        migrations.AddField(
+            model_name="seoconfig",
+            name="og_image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos de la imagen OG",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="herosection",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos de la imagen",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="partner",
+            name="logo_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos del logo",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="project",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos de la imagen",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="service",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos de la imagen",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="showroom",
+            name="image_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos de la imagen",
+            ),
+        ),
+    ]
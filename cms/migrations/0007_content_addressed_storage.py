@@ -0,0 +1,105 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:51
+
+import cms.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0006_image_dimensions_placeholder"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="herosection",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="hero/",
+                verbose_name="Imagen principal",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="partner",
+            name="logo",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="partners/",
+                verbose_name="Logo",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="project",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="projects/",
+                verbose_name="Imagen",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="seoconfig",
+            name="apple_touch_icon",
+            field=models.ImageField(
+                blank=True,
+                help_text="Icono para dispositivos Apple (180x180px)",
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="seo/",
+                verbose_name="Apple Touch Icon",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="seoconfig",
+            name="favicon",
+            field=models.ImageField(
+                blank=True,
+                help_text="Favicon del sitio (32x32px o 64x64px)",
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="seo/",
+                verbose_name="Favicon",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="seoconfig",
+            name="og_image",
+            field=models.ImageField(
+                blank=True,
+                help_text="Imagen para compartir en redes sociales (1200x630px recomendado)",
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="seo/",
+                verbose_name="OG Image",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="service",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="services/",
+                verbose_name="Imagen",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="showroom",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="showroom/",
+                verbose_name="Imagen",
+            ),
+        ),
+    ]
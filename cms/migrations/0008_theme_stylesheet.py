@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:56
+
+import cms.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0007_content_addressed_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="siteconfig",
+            name="theme_stylesheet",
+            field=models.FileField(
+                blank=True,
+                editable=False,
+                storage=cms.storage.content_storage,
+                upload_to="theme/",
+                verbose_name="Hoja de estilos del tema",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:58
+
+import cms.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0008_theme_stylesheet"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="siteconfig",
+            name="icon_stylesheet",
+            field=models.FileField(
+                blank=True,
+                editable=False,
+                storage=cms.storage.content_storage,
+                upload_to="icons/",
+                verbose_name="Hoja de estilos de íconos",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:00
+
+import cms.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0009_icon_stylesheet"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="partner",
+            name="logo_remote",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="partners/",
+                verbose_name="Logo descargado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="partner",
+            name="logo_remote_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos del logo descargado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="partner",
+            name="logo_url_fetch",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Estado de descarga del logo",
+            ),
+        ),
+        migrations.AddField(
+            model_name="seoconfig",
+            name="schema_organization_logo_fetch",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Estado de descarga del logo de la Organización",
+            ),
+        ),
+        migrations.AddField(
+            model_name="seoconfig",
+            name="schema_organization_logo_file",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                null=True,
+                storage=cms.storage.content_storage,
+                upload_to="seo/",
+                verbose_name="Logo de la Organización descargado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="seoconfig",
+            name="schema_organization_logo_file_meta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Metadatos del logo de la Organización",
+            ),
+        ),
+    ]
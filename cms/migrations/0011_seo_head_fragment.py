@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0010_remote_images"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seoconfig",
+            name="head_fragment",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Bloque SEO precalculado"
+            ),
+        ),
+    ]
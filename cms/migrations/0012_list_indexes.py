@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("cms", "0011_seo_head_fragment"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="partner",
+            index=models.Index(fields=["name", "id"], name="cms_partner_name_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="partner",
+            index=models.Index(fields=["order", "id"], name="cms_partner_order_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="partner",
+            index=models.Index(
+                fields=["active", "id"], name="cms_partner_active_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="partner",
+            index=models.Index(
+                fields=["created_at", "id"], name="cms_partner_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["title", "id"], name="cms_project_title_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["order", "id"], name="cms_project_order_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["active", "id"], name="cms_project_active_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["created_at", "id"], name="cms_project_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(fields=["title", "id"], name="cms_service_title_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(fields=["order", "id"], name="cms_service_order_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["active", "id"], name="cms_service_active_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["created_at", "id"], name="cms_service_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["email", "id"], name="cms_user_email_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["role", "id"], name="cms_user_role_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["is_active", "id"], name="cms_user_is_active_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"], name="cms_user_date_joined_id_idx"
+            ),
+        ),
+    ]
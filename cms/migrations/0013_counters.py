@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0012_list_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Modelo",
+                    ),
+                ),
+                ("value", models.IntegerField(default=0, verbose_name="Total")),
+            ],
+            options={
+                "verbose_name": "Contador",
+                "verbose_name_plural": "Contadores",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["updated_at", "id"], name="cms_project_updated_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["updated_at", "id"], name="cms_service_updated_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:32
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("cms", "0013_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="partner",
+            index=models.Index(
+                django.db.models.functions.text.Lower("name"),
+                name="cms_partner_name_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                django.db.models.functions.text.Lower("title"),
+                name="cms_project_title_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                django.db.models.functions.text.Lower("title"),
+                name="cms_service_title_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("username"),
+                name="cms_user_username_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="cms_user_email_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("first_name"),
+                name="cms_user_first_name_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("last_name"),
+                name="cms_user_last_name_lower_idx",
+            ),
+        ),
+    ]
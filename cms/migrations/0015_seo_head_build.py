@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0014_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seoconfig",
+            name="head_fragment_build",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                verbose_name="Build del bloque SEO",
+            ),
+        ),
+    ]
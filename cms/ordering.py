@@ -0,0 +1,129 @@
+"""
+Orden manual de servicios, marcas y proyectos
+Claves de orden con huecos: mover una fila solo escribe esa fila
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .invalidation import schedule_publish
+from .locks import single_flight
+from .tasks import run_in_background
+
+
+# Distancia entre claves consecutivas tras renumerar: admite ~10 movimientos
+# seguidos al mismo hueco antes de necesitar otra renumeración
+ORDER_GAP = 1024
+# Con menos espacio que esto junto a la fila movida se renumera en segundo plano
+REBALANCE_THRESHOLD = 8
+REBALANCE_LOCK_KEY = 'rebalance-{model}'
+
+
+class ReorderError(Exception):
+    """El movimiento pedido no es válido"""
+
+
+def ordered(model):
+    """Orden del panel: (order, pk), total aunque haya claves repetidas"""
+    return model.objects.order_by('order', 'pk')
+
+
+def key_between(lo, hi):
+    """Clave estrictamente entre lo y hi (None = sin vecina) o None si no hay hueco"""
+    if lo is None and hi is None:
+        return ORDER_GAP
+    if lo is None:
+        return hi - ORDER_GAP
+    if hi is None:
+        return lo + ORDER_GAP
+    if hi - lo >= 2:
+        return (lo + hi) // 2
+    return None
+
+
+def _row(rows, pk):
+    row = rows.filter(pk=pk).values_list('order', 'pk').first()
+    if row is None:
+        raise ReorderError(f'No existe la fila {pk}')
+    return row
+
+
+def neighbours(model, pk, previous=None, following=None):
+    """(order, pk) de las filas entre las que queda pk, o None en un extremo
+
+    Basta con una de las dos vecinas: la otra es la fila contigua actual.
+    """
+    if previous is None and following is None:
+        raise ReorderError('Falta la fila anterior o la siguiente')
+    rows = ordered(model).exclude(pk=pk)
+    before = _row(rows, previous) if previous is not None else None
+    after = _row(rows, following) if following is not None else None
+    if before is not None and after is not None and before >= after:
+        # Otro editor reordenó la lista o la página del cliente está vieja
+        raise ReorderError('La fila anterior no está antes de la siguiente')
+    if before is None:
+        order, row_pk = after
+        before = rows.filter(Q(order__lt=order) | Q(order=order, pk__lt=row_pk)) \
+            .order_by('-order', '-pk').values_list('order', 'pk').first()
+    if after is None:
+        order, row_pk = before
+        after = rows.filter(Q(order__gt=order) | Q(order=order, pk__gt=row_pk)) \
+            .values_list('order', 'pk').first()
+    return before, after
+
+
+def move(model, pk, previous=None, following=None):
+    """Ubica la fila pk entre previous y following; retorna su nueva clave
+
+    Solo escribe la fila movida, salvo que no quede hueco entre las vecinas:
+    entonces renumera el modelo completo en la misma transacción.
+    """
+    with transaction.atomic():
+        # Bloquea la fila (PostgreSQL); en SQLite las escrituras ya van en serie
+        if not model.objects.select_for_update().filter(pk=pk).exists():
+            raise model.DoesNotExist
+        before, after = neighbours(model, pk, previous, following)
+        lo, hi = before and before[0], after and after[0]
+        order = key_between(lo, hi)
+        if order is None:
+            rebalance(model)
+            before, after = neighbours(model, pk, previous, following)
+            lo, hi = before and before[0], after and after[0]
+            order = key_between(lo, hi)
+        elif min(order - lo if lo is not None else ORDER_GAP,
+                 hi - order if hi is not None else ORDER_GAP) < REBALANCE_THRESHOLD:
+            transaction.on_commit(lambda: rebalance_in_background(model))
+
+        # Sin save(): cambiar la posición no toca imágenes ni íconos
+        model.objects.filter(pk=pk).update(order=order, updated_at=timezone.now())
+        schedule_publish((model,))
+    return order
+
+
+def rebalance(model):
+    """Renumera las claves con ORDER_GAP de distancia conservando el orden
+
+    Retorna True si cambió alguna fila.
+    """
+    with transaction.atomic():
+        rows = list(ordered(model).select_for_update().only('pk', 'order'))
+        changed = []
+        for position, row in enumerate(rows, 1):
+            if row.order != position * ORDER_GAP:
+                row.order = position * ORDER_GAP
+                changed.append(row)
+        model.objects.bulk_update(changed, ['order'], batch_size=500)
+    return bool(changed)
+
+
+def _rebalance(model):
+    with single_flight(REBALANCE_LOCK_KEY.format(model=model._meta.label_lower)) as acquired:
+        # Si no, otro worker ya está renumerando este modelo
+        if acquired and rebalance(model):
+            # Claves repetidas pudieron ordenarse distinto en la portada
+            schedule_publish((model,))
+
+
+def rebalance_in_background(model):
+    """Renumera el modelo sin bloquear al editor que movió la fila"""
+    run_in_background(_rebalance, model)
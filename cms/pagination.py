@@ -0,0 +1,169 @@
+"""
+Paginación de las listas del panel de AC Technology
+Paginación por cursor (keyset), orden por columna y búsqueda en el servidor
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import Counter
+
+
+PER_PAGE = 25
+
+
+class KeysetPage:
+    """Una página de resultados y los enlaces para recorrer la lista"""
+
+    def __init__(self, object_list, *, total, query, sort, has_next, has_previous,
+                 next_url, previous_url, sort_links):
+        self.object_list = object_list
+        self.total = total
+        self.query = query
+        self.sort = sort
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_url = next_url
+        self.previous_url = previous_url
+        self.sort_links = sort_links
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+# ========== CURSORES ==========
+def encode_cursor(value, pk):
+    """(valor de la columna de orden, pk) -> token opaco para la URL"""
+    if isinstance(value, (datetime, date)):
+        # isoformat conserva los microsegundos: el cursor debe ser exacto
+        value = value.isoformat()
+    data = json.dumps([value, pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(token, field):
+    """Retorna (valor, pk) o None si el token no es válido"""
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        value, pk = json.loads(data)
+        return field.to_python(value), int(pk)
+    except (binascii.Error, ValueError, TypeError, ValidationError):
+        return None
+
+
+# ========== BÚSQUEDA ==========
+def search_alias(name):
+    return f'search_{name}'
+
+
+def prefix_search(queryset, search_fields, query):
+    """Filas cuyo campo empieza por query, sin distinguir mayúsculas
+
+    lower(campo) entre query y el siguiente prefijo: un rango sobre los
+    índices Lower(campo) de cada modelo, a diferencia de un LIKE '%q%'
+    que recorre la tabla completa. En SQLite lower() solo cubre ASCII.
+    """
+    prefix = query.lower()
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    queryset = queryset.alias(**{search_alias(name): Lower(name) for name in search_fields})
+    return queryset.filter(reduce(or_, (
+        Q(**{f'{search_alias(name)}__gte': prefix, f'{search_alias(name)}__lt': upper})
+        for name in search_fields
+    )))
+
+
+# ========== PÁGINA ==========
+def _url(request, **params):
+    query = request.GET.copy()
+    for key in ('after', 'before', *params):
+        query.pop(key, None)
+    for key, value in params.items():
+        if value:
+            query[key] = value
+    return f'?{query.urlencode()}'
+
+
+def keyset_page(request, queryset, *, sort_fields, default_sort, search_fields=(), counted=False,
+                per_page=PER_PAGE):
+    """Página de queryset según ?q=, ?sort= y el cursor ?after= / ?before=
+
+    Cada página es un WHERE (columna, pk) > (valor, pk) sobre un índice
+    (columna, id): el costo no crece con el número de página como OFFSET.
+    sort_fields son las columnas ordenables; '-columna' ordena descendente.
+    Con counted el total de la lista completa sale de la tabla Counter; las
+    búsquedas no tienen total (None): contarlas recorrería todas las coincidencias.
+    """
+    query = request.GET.get('q', '').strip()
+    if query and search_fields:
+        queryset = prefix_search(queryset, search_fields, query)
+
+    sort = request.GET.get('sort', default_sort)
+    if sort.lstrip('-') not in sort_fields:
+        sort = default_sort
+    name = sort.lstrip('-')
+    descending = sort.startswith('-')
+    field = queryset.model._meta.get_field(name)
+
+    before = decode_cursor(request.GET.get('before', ''), field)
+    after = None if before else decode_cursor(request.GET.get('after', ''), field)
+    cursor = before or after
+    # Hacia atrás se recorre en orden inverso y luego se da vuelta la página
+    reverse = descending != bool(before)
+
+    if query and search_fields:
+        total = None
+    elif counted:
+        total = Counter.totals((queryset.model,))[queryset.model._meta.label_lower]
+    else:
+        total = queryset.count()
+    if cursor:
+        value, pk = cursor
+        op = 'lt' if reverse else 'gt'
+        # (col >= v) AND (col > v OR pk > p): el primer término acota el
+        # recorrido del índice, un OR solo lo obligaría a leerlo completo
+        queryset = queryset.filter(
+            Q(**{f'{name}__{op}e': value}),
+            Q(**{f'{name}__{op}': value}) | Q(**{f'pk__{op}': pk}),
+        )
+    order = (f'-{name}', '-pk') if reverse else (name, 'pk')
+    rows = list(queryset.order_by(*order)[:per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if before:
+        rows.reverse()
+        has_next, has_previous = True, more
+    else:
+        has_next, has_previous = more, after is not None
+
+    sort_links = {}
+    for column in sort_fields:
+        active = column == name
+        toggled = f'-{column}' if active and not descending else column
+        sort_links[column] = {
+            'url': _url(request, sort=toggled),
+            'active': active,
+            'descending': active and descending,
+        }
+
+    return KeysetPage(
+        rows,
+        total=total,
+        query=query,
+        sort=sort,
+        has_next=has_next and bool(rows),
+        has_previous=has_previous and bool(rows),
+        next_url=_url(request, after=encode_cursor(getattr(rows[-1], name), rows[-1].pk)) if rows else '',
+        previous_url=_url(request, before=encode_cursor(getattr(rows[0], name), rows[0].pk)) if rows else '',
+        sort_links=sort_links,
+    )
@@ -0,0 +1,252 @@
+"""
+Imágenes remotas del CMS de AC Technology
+Descarga a media/ los logos configurados por URL y los re-valida periódicamente
+"""
+import http.client
+import ipaddress
+import mimetypes
+import urllib.error
+import urllib.request
+from datetime import timedelta
+from pathlib import PurePosixPath
+from urllib.parse import urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from PIL import Image, UnidentifiedImageError
+
+from .images import normalize_upload, process_instance_images
+from .locks import single_flight
+
+
+# (modelo, campo URL, ImageField con la copia local, JSONField con el estado)
+REMOTE_IMAGE_FIELDS = (
+    ('cms.Partner', 'logo_url', 'logo_remote', 'logo_url_fetch'),
+    ('cms.SEOConfig', 'schema_organization_logo', 'schema_organization_logo_file', 'schema_organization_logo_fetch'),
+)
+
+REFRESH_INTERVAL = timedelta(seconds=getattr(settings, 'CMS_REMOTE_IMAGE_REFRESH', 60 * 60 * 24))
+TIMEOUT = getattr(settings, 'CMS_REMOTE_IMAGE_TIMEOUT', 10)
+MAX_BYTES = getattr(settings, 'CMS_REMOTE_IMAGE_MAX_BYTES', 10 * 1024 * 1024)
+
+USER_AGENT = 'ACTechnology-CMS/1.0 (+remote image fetcher)'
+FETCH_LOCK_KEY = 'remote-image-{model}-{pk}'
+
+
+class RemoteImageError(Exception):
+    """La URL no respondió con una imagen válida"""
+
+
+class BlockedAddressError(OSError):
+    """La URL apunta a una dirección interna (loopback, privada, link-local...)"""
+
+
+def remote_image_fields(model):
+    """(campo URL, ImageField local, campo de estado) configurados para el modelo"""
+    label = model._meta.label
+    return [fields[1:] for fields in REMOTE_IMAGE_FIELDS if fields[0] == label]
+
+
+def remote_image_models():
+    return [apps.get_model(label) for label in dict.fromkeys(f[0] for f in REMOTE_IMAGE_FIELDS)]
+
+
+# ========== DESCARGA ==========
+def _allowed_hosts():
+    # Hosts exentos del bloqueo de direcciones internas (ej. un servidor de
+    # pruebas en 127.0.0.1); se lee en cada descarga
+    return {host.lower() for host in getattr(settings, 'CMS_REMOTE_IMAGE_ALLOWED_HOSTS', ())}
+
+
+def check_address(host, address):
+    """Lanza BlockedAddressError si address no es una dirección pública
+
+    Se verifica la dirección a la que realmente se conectó el socket, en cada
+    redirección: resolver el nombre antes no basta (DNS rebinding).
+    """
+    if host.lower() in _allowed_hosts():
+        return
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    if not ip.is_global or ip.is_multicast:
+        raise BlockedAddressError(f'Dirección no permitida para {host}: {ip}')
+
+
+class _CheckedConnectionMixin:
+    def connect(self):
+        super().connect()
+        try:
+            check_address(self.host, self.sock.getpeername()[0])
+        except BlockedAddressError:
+            self.close()
+            raise
+
+
+class _CheckedHTTPConnection(_CheckedConnectionMixin, http.client.HTTPConnection):
+    pass
+
+
+class _CheckedHTTPSConnection(_CheckedConnectionMixin, http.client.HTTPSConnection):
+    pass
+
+
+class _CheckedHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_CheckedHTTPConnection, req)
+
+
+class _CheckedHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_CheckedHTTPSConnection, req, context=self._context)
+
+
+# Sin ProxyHandler: a través de un proxy no se puede verificar el destino
+_opener = urllib.request.build_opener(
+    urllib.request.ProxyHandler({}), _CheckedHTTPHandler, _CheckedHTTPSHandler,
+)
+
+
+def _file_name(url, content_type):
+    name = PurePosixPath(urlsplit(url).path).name or 'logo'
+    if not PurePosixPath(name).suffix:
+        name += mimetypes.guess_extension(content_type) or ''
+    return name
+
+
+def fetch_remote_image(url, state):
+    """Descarga una imagen con petición condicional
+
+    Retorna (archivo normalizado o None si no cambió, estado nuevo). Lanza
+    RemoteImageError si la respuesta no es una imagen válida.
+    """
+    if urlsplit(url).scheme not in ('http', 'https'):
+        raise RemoteImageError(f'Esquema no soportado: {url}')
+
+    request = urllib.request.Request(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept': 'image/avif,image/webp,image/png,image/jpeg,image/*;q=0.8',
+    })
+    if state.get('url') == url:
+        if state.get('etag'):
+            request.add_header('If-None-Match', state['etag'])
+        if state.get('last_modified'):
+            request.add_header('If-Modified-Since', state['last_modified'])
+
+    new_state = {'url': url, 'checked_at': timezone.now().isoformat()}
+    try:
+        with _opener.open(request, timeout=TIMEOUT) as response:
+            content_type = response.headers.get_content_type()
+            if not content_type.startswith('image/'):
+                raise RemoteImageError(f'Tipo de contenido no válido: {content_type}')
+            data = response.read(MAX_BYTES + 1)
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            # Sin cambios: se conservan los validadores anteriores
+            return None, {**state, **new_state, 'error': ''}
+        raise RemoteImageError(f'HTTP {e.code}')
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise RemoteImageError(str(getattr(e, 'reason', e)))
+
+    if len(data) > MAX_BYTES:
+        raise RemoteImageError(f'La imagen supera {MAX_BYTES // 1024} KB')
+
+    try:
+        upload = normalize_upload(SimpleUploadedFile(_file_name(url, content_type), data, content_type))
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValidationError) as e:
+        raise RemoteImageError(f'Imagen no válida: {e}')
+
+    new_state.update(etag=headers.get('ETag', ''), last_modified=headers.get('Last-Modified', ''), error='')
+    return upload, new_state
+
+
+# ========== COPIAS LOCALES ==========
+def is_due(url, state, now=None):
+    """True si la URL cambió o pasó el intervalo de re-validación"""
+    if state.get('url') != url:
+        return True
+    checked_at = parse_datetime(state.get('checked_at') or '')
+    return checked_at is None or checked_at + REFRESH_INTERVAL <= (now or timezone.now())
+
+
+def needs_fetch(instance):
+    """True si alguna URL de la instancia no coincide con su copia local"""
+    for url_field, file_field, state_field in remote_image_fields(type(instance)):
+        url = getattr(instance, url_field)
+        state = getattr(instance, state_field) or {}
+        if url != state.get('url', '') or (not url and getattr(instance, file_field)):
+            return True
+    return False
+
+
+def localize_instance(instance, force=False):
+    """Actualiza las copias locales de las URLs de la instancia
+
+    Retorna (campos a guardar, True si cambió algún archivo). Los errores de
+    descarga quedan en el estado y se conserva la copia anterior.
+    """
+    changed, files_changed = {}, False
+    for url_field, file_field, state_field in remote_image_fields(type(instance)):
+        url = getattr(instance, url_field)
+        state = getattr(instance, state_field) or {}
+        field_file = getattr(instance, file_field)
+
+        if not url:
+            if field_file or state:
+                # El archivo puede estar deduplicado con otro: no se borra
+                setattr(instance, file_field, None)
+                changed.update({file_field: None, state_field: {}})
+                files_changed = True
+            continue
+        if not force and not is_due(url, state):
+            continue
+
+        try:
+            upload, new_state = fetch_remote_image(url, {} if force else state)
+        except RemoteImageError as e:
+            new_state = {**state, 'checked_at': timezone.now().isoformat(), 'error': str(e)}
+            if state.get('url') != url:
+                # La copia anterior es de otra URL: mejor la URL remota que un logo equivocado
+                new_state.update(url=url, etag='', last_modified='')
+                if field_file:
+                    setattr(instance, file_field, None)
+                    changed[file_field] = None
+                    files_changed = True
+            upload = None
+
+        if upload is not None:
+            previous = field_file.name
+            field_file.save(upload.name, upload, save=False)
+            if field_file.name != previous:
+                changed[file_field] = field_file.name
+                files_changed = True
+        setattr(instance, state_field, new_state)
+        changed[state_field] = new_state
+
+    if files_changed:
+        changed.update(process_instance_images(instance))
+    return changed, files_changed
+
+
+def localize(model, pk, force=False):
+    """Descarga las imágenes remotas de una fila con un solo worker a la vez
+
+    Retorna True si cambió algún archivo local.
+    """
+    with single_flight(FETCH_LOCK_KEY.format(model=model._meta.label_lower, pk=pk)) as acquired:
+        if not acquired:
+            # Otro worker ya está descargando esta fila
+            return False
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None:
+            return False
+        changed, files_changed = localize_instance(instance, force)
+        if changed:
+            # Sin save(): volvería a encolar la descarga y a republicar
+            model.objects.filter(pk=pk).update(**changed)
+        return files_changed
@@ -0,0 +1,82 @@
+"""
+Bloque SEO de la portada de AC Technology
+Precalcula las meta tags y el JSON-LD al publicar SEO, contacto o configuración
+"""
+import json
+import re
+
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import get_build_id
+from .models import SiteConfig, ContactInfo, SEOConfig
+
+
+# El dominio depende de la petición: se guarda este marcador y se reemplaza
+# al servir la portada
+ORIGIN_PLACEHOLDER = '__CMS_ORIGIN__'
+
+# Escapes para incrustar JSON dentro de <script> (como json_script de Django)
+JSON_SCRIPT_ESCAPES = {ord('>'): '\\u003E', ord('<'): '\\u003C', ord('&'): '\\u0026'}
+
+BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+
+
+def organization_jsonld(seo, site_config, contact):
+    """Datos estructurados Organization de schema.org"""
+    data = {
+        '@context': 'https://schema.org',
+        '@type': 'Organization',
+        'name': seo.schema_organization_name or site_config.brand_name,
+        'url': seo.canonical_url or f'{ORIGIN_PLACEHOLDER}/',
+    }
+    if seo.get_organization_logo_url():
+        data['logo'] = ORIGIN_PLACEHOLDER + seo.get_organization_logo_url()
+    elif seo.schema_organization_logo:
+        data['logo'] = seo.schema_organization_logo
+    data['contactPoint'] = {
+        '@type': 'ContactPoint',
+        'telephone': contact.phone,
+        'contactType': 'customer service',
+        'email': contact.email,
+    }
+    data['sameAs'] = [url for url in (contact.facebook, contact.instagram, contact.linkedin, contact.youtube) if url]
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).translate(JSON_SCRIPT_ESCAPES)
+
+
+def build_seo_head(seo, site_config, contact):
+    """Meta tags, favicons, analytics y JSON-LD ya renderizados y minificados"""
+    html = render_to_string('cms/index/seo_head.html', {
+        'seo': seo,
+        'site_config': site_config,
+        'origin': ORIGIN_PLACEHOLDER,
+        'organization_jsonld': mark_safe(organization_jsonld(seo, site_config, contact)),
+    })
+    return BETWEEN_TAGS_RE.sub('><', HTML_COMMENT_RE.sub('', html)).strip()
+
+
+def publish_seo_head():
+    """Recalcula el bloque SEO y lo guarda en SEOConfig.head_fragment con el build actual"""
+    seo = SEOConfig.objects.filter(pk=1).first()
+    if seo is None:
+        # Sin configuración SEO guardada la portada lo renderiza por petición
+        return ''
+    site_config = SiteConfig.objects.filter(pk=1).first() or SiteConfig()
+    contact = ContactInfo.objects.filter(pk=1).first() or ContactInfo()
+    fragment = build_seo_head(seo, site_config, contact)
+    # Sin save(): guardar SEOConfig volvería a publicar la portada
+    SEOConfig.objects.filter(pk=1).update(head_fragment=fragment, head_fragment_build=get_build_id())
+    return fragment
+
+
+def seo_head_is_stale():
+    """True si el bloque SEO guardado lo renderizó otro build (otra plantilla)"""
+    return SEOConfig.objects.filter(pk=1).exclude(head_fragment_build=get_build_id()).exists()
+
+
+def render_seo_head(seo, site_config, contact, request):
+    """Bloque SEO para la petición: precalculado por este build o renderizado ahora"""
+    fragment = seo.head_fragment if seo.head_fragment_build == get_build_id() else ''
+    fragment = fragment or build_seo_head(seo, site_config, contact)
+    return mark_safe(fragment.replace(ORIGIN_PLACEHOLDER, f'{request.scheme}://{request.get_host()}'))
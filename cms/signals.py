@@ -0,0 +1,191 @@
+"""
+Señales del CMS de AC Technology
+Invalida la caché pública cuando cambia el contenido del sitio
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_migrate, post_save, post_delete
+
+from .cache import bump_content_version, bump_config_version, bump_model_versions, set_last_modified
+from .export import export_site
+from .icons import publish_icons
+from .images import image_fields, process_instance_images
+from .invalidation import schedule_publish
+from .seo import publish_seo_head, seo_head_is_stale
+from .remote_images import localize, needs_fetch, remote_image_models
+from .theme import publish_theme
+from .tasks import run_in_background, warm_index_cache
+from .models import (
+    User, SiteConfig, HeroSection, Service, Partner,
+    Showroom, Project, ContactInfo, SEOConfig, HomepageSnapshot, Counter
+)
+
+
+# Modelos cuyo contenido se muestra en la página pública
+CONTENT_MODELS = (
+    SiteConfig, HeroSection, Service, Partner,
+    Showroom, Project, ContactInfo, SEOConfig,
+)
+
+# Singletons memoizados por CachedSingletonMixin.load_cached()
+SINGLETON_MODELS = (SiteConfig, HeroSection, Showroom, ContactInfo, SEOConfig)
+
+# Modelos que lee el bloque SEO precalculado del <head>
+SEO_MODELS = (SEOConfig, ContactInfo, SiteConfig)
+
+# Modelos con total en el dashboard (tabla Counter)
+COUNTED_MODELS = (Service, Partner, Project, User)
+
+
+def publish_content(config_changed=False, models=CONTENT_MODELS):
+    """Publica el snapshot de la portada e invalida la caché
+
+    models son los modelos que cambiaron: solo se invalidan los fragmentos
+    de la portada que los leen.
+    """
+    # Primero los singletons: el snapshot no debe leer una configuración
+    # memoizada anterior
+    if config_changed:
+        bump_config_version()
+    if any(model in SEO_MODELS for model in models):
+        publish_seo_head()
+    snapshot = HomepageSnapshot.publish()
+    set_last_modified(snapshot.last_modified)
+    # La nueva generación solo existe cuando el snapshot ya está publicado
+    bump_model_versions(model._meta.label_lower for model in models)
+    bump_content_version()
+
+    # Precalentar la caché: los visitantes no esperan el primer render
+    if getattr(settings, 'CMS_WARM_INDEX', True):
+        run_in_background(warm_index_cache)
+
+    # Regenerar el sitio estático si está configurado
+    if getattr(settings, 'CMS_STATIC_EXPORT_ROOT', None):
+        export_site(settings.CMS_STATIC_EXPORT_ROOT)
+
+
+def publish_after_migrate(sender, plan=None, **kwargs):
+    """Publica el snapshot tras migrar, con el código y el esquema nuevos
+
+    Crea el snapshot en instalaciones nuevas y reemplaza el escrito por el
+    código anterior, que puede tener campos que ya no existen. Si el bloque
+    SEO lo renderizó otro build también se recalcula, aunque no haya
+    migraciones pendientes. No es una migración de datos: esta usaría los
+    modelos históricos, no los actuales.
+    """
+    try:
+        if not plan and not seo_head_is_stale() and HomepageSnapshot.objects.filter(pk=1).exists():
+            return
+        # Primero el bloque SEO: el snapshot guarda una copia de SEOConfig
+        publish_seo_head()
+        snapshot = HomepageSnapshot.publish()
+    except DatabaseError:
+        # Migración parcial (hacia atrás): el esquema no es el de los modelos
+        return
+    set_last_modified(snapshot.last_modified)
+    bump_content_version()
+
+
+def content_changed(sender, **kwargs):
+    """Cualquier cambio de contenido republica la portada"""
+    # Al confirmar y una sola vez por lote: guardar 50 filas de una lista
+    # editable publica una vez, no 50
+    schedule_publish((sender,), config_changed=sender in SINGLETON_MODELS)
+
+
+def row_created(sender, created, raw=False, **kwargs):
+    """Suma la fila nueva al contador del modelo"""
+    if created and not raw:
+        # Dentro de la transacción: si se revierte, el contador también
+        Counter.adjust(sender, 1)
+
+
+def row_deleted(sender, **kwargs):
+    """Resta la fila eliminada del contador del modelo"""
+    Counter.adjust(sender, -1)
+
+
+def images_changed(sender, instance, raw=False, **kwargs):
+    """Genera las variantes responsive de las imágenes nuevas o cambiadas"""
+    if raw:
+        return
+    try:
+        changed = process_instance_images(instance)
+    except OSError:
+        # Archivo ilegible: la imagen se sirve sin variantes
+        return
+    if changed:
+        # update() no vuelve a disparar post_save
+        sender.objects.filter(pk=instance.pk).update(**changed)
+
+
+def theme_changed(sender, instance, raw=False, **kwargs):
+    """Regenera la hoja de variables CSS cuando cambian los colores del sitio"""
+    if raw:
+        return
+    try:
+        changed = publish_theme(instance)
+    except ValueError:
+        # Color que no es #rrggbb: se mantiene el tema anterior
+        return
+    if changed:
+        sender.objects.filter(pk=instance.pk).update(theme_stylesheet=instance.theme_stylesheet.name)
+
+
+def publish_site_icons():
+    """Regenera la fuente de íconos y obliga a recargar SiteConfig si cambió"""
+    try:
+        changed = publish_icons()
+    except OSError:
+        # Font Awesome no disponible en CMS_FONTAWESOME_ROOT: se mantiene la hoja anterior
+        return
+    if changed:
+        bump_config_version()
+
+
+def icons_changed(sender, raw=False, **kwargs):
+    """Los íconos de servicios y del hero definen el subconjunto de la fuente"""
+    if raw:
+        return
+    # Se ejecuta antes que publish_content: el snapshot ya referencia la hoja nueva
+    schedule_publish(icons=True)
+
+
+def localize_remote_images(model, pk):
+    """Descarga las imágenes remotas de una fila y republica si cambiaron"""
+    if localize(model, pk):
+        publish_content(config_changed=model in SINGLETON_MODELS, models=(model,))
+
+
+def remote_images_changed(sender, instance, raw=False, **kwargs):
+    """Una URL de imagen nueva se descarga en segundo plano sin bloquear al editor"""
+    if raw or not needs_fetch(instance):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: run_in_background(localize_remote_images, sender, pk))
+
+
+post_migrate.connect(publish_after_migrate, sender=apps.get_app_config('cms'), dispatch_uid='cms.publish_after_migrate')
+
+for model in COUNTED_MODELS:
+    post_save.connect(row_created, sender=model, dispatch_uid=f'cms.row_created.{model.__name__}')
+    post_delete.connect(row_deleted, sender=model, dispatch_uid=f'cms.row_deleted.{model.__name__}')
+
+# Antes que content_changed: el snapshot ya referencia la hoja nueva
+post_save.connect(theme_changed, sender=SiteConfig, dispatch_uid='cms.theme_changed.SiteConfig')
+
+for model in (Service, HeroSection):
+    post_save.connect(icons_changed, sender=model, dispatch_uid=f'cms.icons_changed.save.{model.__name__}')
+    post_delete.connect(icons_changed, sender=model, dispatch_uid=f'cms.icons_changed.delete.{model.__name__}')
+
+for model in remote_image_models():
+    post_save.connect(remote_images_changed, sender=model, dispatch_uid=f'cms.remote_images_changed.{model.__name__}')
+
+for model in CONTENT_MODELS:
+    if image_fields(model):
+        # Registrada antes que content_changed: el snapshot ya incluye las variantes
+        post_save.connect(images_changed, sender=model, dispatch_uid=f'cms.images_changed.{model.__name__}')
+
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'cms.content_changed.save.{model.__name__}')
+    post_delete.connect(content_changed, sender=model, dispatch_uid=f'cms.content_changed.delete.{model.__name__}')
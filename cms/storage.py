@@ -0,0 +1,150 @@
+"""
+Storages del CMS de AC Technology
+"""
+import gzip
+import hashlib
+import logging
+import posixpath
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se generan .gz
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:  # sin rcssmin se usa el minificador CSS conservador
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:  # sin rjsmin los .js se publican sin minificar
+    rjsmin = None
+
+
+logger = logging.getLogger(__name__)
+
+# Los nombres direccionados por contenido no cambian nunca: caché de un año
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+HASH_LENGTH = 32
+HASHED_NAME_RE = re.compile(r'(^|/)[0-9a-f]{%d}\.[A-Za-z0-9]+$' % HASH_LENGTH)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Guarda cada archivo con el hash de su contenido como nombre
+
+    partners/logo-final(2).png -> partners/3f2a...9c.png. Dos subidas
+    idénticas comparten el mismo archivo y un archivo nunca se sobrescribe,
+    así que sus URLs se pueden cachear para siempre.
+    """
+    content_addressed = True
+
+    def __init__(self, **kwargs):
+        # Dos subidas idénticas simultáneas escriben los mismos bytes:
+        # sobrescribir es seguro y evita el bucle de nombres alternativos
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        name = posixpath.join(directory, digest.hexdigest()[:HASH_LENGTH] + extension)
+        if self.exists(name):
+            # Contenido ya almacenado: deduplicar sin volver a escribir
+            return name
+        return super()._save(name, content)
+
+
+def is_immutable_name(name):
+    """True si el archivo tiene un nombre direccionado por contenido"""
+    return bool(HASHED_NAME_RE.search(name))
+
+
+def content_storage():
+    """Storage de los ImageField del CMS (callable para las migraciones)"""
+    return _content_storage
+
+
+_content_storage = ContentAddressedStorage()
+
+
+# ========== ARCHIVOS ESTÁTICOS ==========
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.html', '.map')
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+CSS_SPACE_RE = re.compile(r'\s+')
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(css):
+    """Minifica CSS (rcssmin si está instalado, si no un minificador conservador)"""
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    css = CSS_COMMENT_RE.sub('', css)
+    css = CSS_SPACE_RE.sub(' ', css)
+    css = CSS_PUNCTUATION_RE.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """Minifica JS con rjsmin; sin él se deja intacto (minificar a mano no es seguro)"""
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+    return js
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """collectstatic con nombres con hash, minificación y variantes .gz/.br
+
+    Las plantillas siguen usando {% static %}; el manifest resuelve el nombre
+    con hash (styles.3f2a9c1b7d4e.css), que puede cachearse para siempre y
+    servirse precomprimido sin comprimir en cada petición.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        if rjsmin is None:
+            logger.warning('rjsmin no está instalado: los archivos .js se publican sin minificar '
+                           '(pip install rjsmin)')
+        for hashed_name in sorted(set(self.hashed_files.values())):
+            self._minify(hashed_name)
+            self._compress(hashed_name)
+
+    def _minify(self, name):
+        minifier = {'.css': minify_css, '.js': minify_js}.get(posixpath.splitext(name)[1])
+        if minifier is None:
+            return
+        with self.open(name) as f:
+            source = f.read().decode('utf-8')
+        minified = minifier(source)
+        if minified != source:
+            self.delete(name)
+            self._save(name, ContentFile(minified.encode('utf-8')))
+
+    def _compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as f:
+            content = f.read()
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+        for suffix, compressed in variants:
+            # Solo vale la pena si realmente ahorra bytes
+            if len(compressed) < len(content):
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
@@ -0,0 +1,51 @@
+"""
+Tareas en segundo plano del CMS de AC Technology
+Trabajo que no debe bloquear la petición del editor (precalentar la portada,
+renumerar un orden, descargar logos): un hilo daemon por tarea
+"""
+import threading
+
+from django.db import DatabaseError, connections
+
+from .cache import (
+    acquire_index_lock, get_content_version, get_index_origins, release_index_lock, set_index_page,
+)
+from .export import ExportRequest
+
+
+def _run(func, args):
+    try:
+        func(*args)
+    finally:
+        # Hilo propio: nadie más cierra sus conexiones
+        connections.close_all()
+
+
+def run_in_background(func, *args):
+    """Ejecuta func(*args) en un hilo daemon que cierra sus conexiones al terminar"""
+    thread = threading.Thread(target=_run, args=(func, args), daemon=True)
+    thread.start()
+    return thread
+
+
+def warm_index_cache():
+    """Renderiza la portada de cada dominio ya servido
+
+    Se ejecuta tras publicar contenido: el primer visitante encuentra la
+    portada nueva en caché en lugar de renderizarla.
+    """
+    # Importación diferida: las vistas importan los módulos de publicación
+    from .views import render_index
+    for origin in get_index_origins():
+        request = ExportRequest(origin)
+        if not acquire_index_lock(request):
+            # Otro worker ya la está renderizando
+            continue
+        try:
+            version = get_content_version()
+            set_index_page(request, render_index(request), version)
+        except DatabaseError:
+            # Base de datos ocupada: la próxima visita renderizará la portada
+            return
+        finally:
+            release_index_lock(request)
@@ -0,0 +1,106 @@
+"""
+Template tags de imágenes responsive para AC Technology
+"""
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from cms.images import MIME_TYPES, image_meta
+
+register = template.Library()
+
+# Orden de los <source> del <picture>: el navegador usa el primero que soporta
+SOURCE_FORMATS = ('avif', 'webp')
+
+
+def _srcsets(field_file, meta):
+    """Retorna {formato: 'url 480w, url 800w'} a partir de los metadatos"""
+    storage = getattr(field_file, 'storage', default_storage)
+    srcsets = {}
+    for variant in meta.get('variants', []):
+        srcsets.setdefault(variant['format'], []).append(
+            f"{storage.url(variant['name'])} {variant['width']}w"
+        )
+    return {fmt: ', '.join(items) for fmt, items in srcsets.items()}
+
+
+def _picture_sources(srcsets, fallback):
+    """[(formato, srcset)] de los <source> en el orden en que se emiten
+
+    responsive_image y preload_image lo comparten: el preload debe pedir el
+    mismo formato que el <picture> va a usar o la imagen se descarga dos veces.
+    """
+    def rank(fmt):
+        return SOURCE_FORMATS.index(fmt) if fmt in SOURCE_FORMATS else len(SOURCE_FORMATS)
+    return sorted(((fmt, srcset) for fmt, srcset in srcsets.items() if fmt != fallback),
+                  key=lambda item: rank(item[0]))
+
+
+def _layout_attrs(meta):
+    """width/height y placeholder LQIP guardados al subir la imagen
+
+    Reservan el espacio de la imagen (sin saltos de layout) y muestran una
+    versión borrosa mientras carga, sin abrir el archivo al renderizar.
+    """
+    if not meta.get('width'):
+        return ''
+    attrs = format_html(' width="{}" height="{}"', meta['width'], meta['height'])
+    if meta.get('placeholder') and meta.get('fallback') != 'png':
+        # Las imágenes con transparencia (logos) no llevan fondo
+        attrs += format_html(
+            ' style="background:{} url({}) center/cover no-repeat"',
+            meta['color'], meta['placeholder'],
+        )
+    return mark_safe(attrs)
+
+
+@register.simple_tag
+def responsive_image(obj, field_name, alt='', css_class='', sizes='100vw', loading='lazy'):
+    """<picture> con srcset AVIF/WebP y fallback JPEG/PNG
+
+    Uso: {% responsive_image hero 'image' alt=hero.title css_class='h-full w-full' sizes='50vw' %}
+    """
+    field_file = getattr(obj, field_name)
+    meta = image_meta(obj, field_name)
+    srcsets = _srcsets(field_file, meta)
+    fallback = meta.get('fallback')
+
+    layout = _layout_attrs(meta)
+
+    if not srcsets or fallback not in srcsets:
+        # Imagen aún sin procesar: se sirve el original
+        return format_html(
+            '<img src="{}" alt="{}" class="{}"{} loading="{}" decoding="async"/>',
+            field_file.url, alt, css_class, layout, loading,
+        )
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}"/>',
+        ((MIME_TYPES[fmt], srcset, sizes) for fmt, srcset in _picture_sources(srcsets, fallback)),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}"{} loading="{}" decoding="async"/></picture>',
+        sources, field_file.url, srcsets[fallback], sizes, alt, css_class, layout, loading,
+    )
+
+
+@register.simple_tag
+def preload_image(obj, field_name, sizes='100vw'):
+    """<link rel="preload"> para la imagen LCP (ej: la del hero)"""
+    field_file = getattr(obj, field_name)
+    if not field_file:
+        return ''
+    meta = image_meta(obj, field_name)
+    srcsets = _srcsets(field_file, meta)
+    fallback = meta.get('fallback')
+    if not srcsets or fallback not in srcsets:
+        # Igual que responsive_image: imagen aún sin procesar
+        return format_html('<link rel="preload" as="image" href="{}" fetchpriority="high"/>', field_file.url)
+    # El primer <source> del <picture> (AVIF si existe); los navegadores que
+    # no soportan su type descartan el preload en lugar de descargar otra imagen
+    fmt, srcset = (_picture_sources(srcsets, fallback) or [(fallback, srcsets[fallback])])[0]
+    return format_html(
+        '<link rel="preload" as="image" type="{}" imagesrcset="{}" imagesizes="{}" fetchpriority="high"/>',
+        MIME_TYPES[fmt], srcset, sizes,
+    )
@@ -1,3 +1,875 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, OperationalError, connection, transaction
+from django.template.loader import get_template as real_get_template
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from PIL import Image
+
+from . import locks
+from .bulk import run_bulk_action
+from .cache import (
+    acquire_index_lock, bump_config_version, bump_content_version, bump_model_versions, get_build_id,
+    get_content_version, get_index_page, release_index_lock,
+)
+from .invalidation import coalesce
+from .export import export_site
+from .images import normalize_upload
+from .models import ContactInfo, Counter, HomepageSnapshot, Partner, SEOConfig, Service, SiteConfig, User
+from .ordering import ORDER_GAP, key_between, move, rebalance
+from .pagination import keyset_page
+from .remote_images import RemoteImageError, fetch_remote_image
+from .storage import HASH_LENGTH, ContentAddressedStorage, is_immutable_name
+from .tasks import run_in_background, warm_index_cache
+from .seo import render_seo_head
+from .signals import publish_after_migrate, publish_content
+from .templatetags.cms_images import preload_image, responsive_image
+from .theme import publish_theme, shade_ramp
+from .utility_css import SHADES, unresolved_classes
+
+
+# Caché en memoria: los tests no deben tocar la caché en disco del proyecto
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(
+    CACHES=TEST_CACHES,
+    CMS_LOCK_DIR=tempfile.mkdtemp(),
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    # Sin hilos de precalentamiento: publicar es síncrono en los tests
+    CMS_WARM_INDEX=False,
+)
+class CMSTestCase(TestCase):
+    """Caché, locks y media aislados; las publicaciones corren al confirmar"""
+
+    def setUp(self):
+        # LocMemCache es global al proceso: cada test empieza sin portada cacheada
+        cache.clear()
+
+    def publishing(self):
+        # TestCase nunca confirma: ejecutar los on_commit al salir del bloque
+        return self.captureOnCommitCallbacks(execute=True)
+
+    def get_page(self, **extra):
+        """GET de la portada; la respuesta se cierra al terminar el test
+
+        Cerrarla libera el lock de render de una portada enviada por partes,
+        como hace el servidor WSGI aunque el cliente no la lea.
+        """
+        response = self.client.get('/', **extra)
+        self.addCleanup(response.close)
+        return response
+
+    def get_content(self, response):
+        """Cuerpo completo; consumir el stream es lo que cachea la portada"""
+        if response.streaming:
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+
+# ========== EXPORTACIÓN ESTÁTICA ==========
+@override_settings(CACHES=TEST_CACHES)
+class ExportSiteTests(TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.media = self.tmp / 'media'
+        (self.media / 'partners').mkdir(parents=True)
+        (self.media / 'partners' / 'logo.png').write_bytes(b'png')
+        (self.tmp / 'secret.txt').write_text('SECRET_KEY')
+        self.output = self.tmp / 'public'
+
+    def export(self, *urls):
+        html = ''.join(f'<img src="{url}">' for url in urls)
+        with override_settings(MEDIA_ROOT=self.media), \
+                mock.patch('cms.views.render_index', return_value=html):
+            export_site(self.output, 'https://example.com')
+
+    def test_copies_same_origin_media(self):
+        self.export('https://example.com/media/partners/logo.png', '/media/partners/logo.png')
+        self.assertEqual((self.output / 'media' / 'partners' / 'logo.png').read_bytes(), b'png')
+
+    def test_rejects_paths_outside_media_root(self):
+        self.export(
+            'https://example.com/media/../secret.txt',
+            '/media/%2e%2e/secret.txt',
+            '/media//' + str(self.tmp / 'secret.txt').lstrip('/'),
+            '/static/../acweb/settings.py',
+        )
+        exported = {path.name for path in self.output.rglob('*')}
+        self.assertNotIn('secret.txt', exported)
+        self.assertNotIn('settings.py', exported)
+        self.assertFalse((self.tmp / 'secret.txt.gz').exists())
+
+    def test_rejects_other_hosts(self):
+        self.export('https://attacker.example/media/partners/logo.png')
+        self.assertFalse((self.output / 'media').exists())
+
+
+# ========== LOCKS ==========
+class LockTests(TestCase):
+
+    def setUp(self):
+        override = override_settings(CMS_LOCK_DIR=tempfile.mkdtemp())
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def acquire_in_thread(self, name):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(locks.acquire(name)))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_single_owner_until_released(self):
+        self.assertTrue(locks.acquire('index-http-example.com'))
+        self.assertFalse(self.acquire_in_thread('index-http-example.com'))
+        self.assertTrue(self.acquire_in_thread('index-https-example.com'))
+        locks.release('index-http-example.com')
+        self.assertTrue(self.acquire_in_thread('index-http-example.com'))
+        locks.release('index-http-example.com')
+        locks.release('index-https-example.com')
+
+
+# ========== HOJA UTILITARIA ==========
+class BuildCSSTests(TestCase):
+
+    def test_reports_unknown_utility_classes(self):
+        base = Path(tempfile.mkdtemp())
+        (base / 'cms' / 'templates').mkdir(parents=True)
+        (base / 'cms' / 'templates' / 'row.html').write_text(
+            '<li class="flex cursor-move {% if x %}hover:bg-gray-50{% endif %} cursor-grabbing fa-star">'
+            '<i class="fas fa-grip-vertical focus:outline-none hover:ring-magic"></i></li>'
+        )
+        self.assertEqual(list(unresolved_classes(base)), ['cursor-grabbing', 'hover:ring-magic'])
+
+    def test_templates_have_no_unknown_classes(self):
+        self.assertEqual(unresolved_classes(), {})
+
+    def test_strict_fails_on_unknown_classes(self):
+        output = Path(tempfile.mkdtemp()) / 'utilities.css'
+        with mock.patch('cms.management.commands.build_css.unresolved_classes',
+                        return_value={'cursor-grabbing': ['row.html']}):
+            call_command('build_css', output=output, stdout=io.StringIO(), stderr=io.StringIO())
+            with self.assertRaisesMessage(CommandError, '1 clases sin generar'):
+                call_command('build_css', output=output, strict=True, stdout=io.StringIO(), stderr=io.StringIO())
+
+
+# ========== INGESTA DE IMÁGENES ==========
+def image_upload(img, fmt, name, **options):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=Image.MIME[fmt])
+
+
+def noise(size, mode='RGB'):
+    """Imagen que no se comprime: cuesta lo mismo en PNG que en bytes crudos"""
+    return Image.frombytes(mode, size, os.urandom(size[0] * size[1] * len(mode)))
+
+
+class NormalizeUploadTests(TestCase):
+
+    def normalized(self, upload):
+        result = normalize_upload(upload)
+        result.seek(0)
+        return Image.open(io.BytesIO(result.read())), result
+
+    @mock.patch('cms.images.MAX_DIMENSION', 100)
+    def test_downscales_to_max_dimension(self):
+        img, _ = self.normalized(image_upload(Image.new('RGB', (300, 200), 'red'), 'JPEG', 'foto.jpg'))
+        self.assertEqual(img.size, (100, 67))
+        self.assertEqual(img.format, 'JPEG')
+
+    def test_applies_orientation_and_strips_exif(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotar 90° en sentido horario
+        exif[0x010F] = 'Cámara'  # Make
+        img, _ = self.normalized(image_upload(Image.new('RGB', (40, 20), 'red'), 'JPEG', 'foto.jpg', exif=exif))
+        self.assertEqual(img.size, (20, 40))
+        self.assertEqual(dict(img.getexif()), {})
+        self.assertNotIn('exif', img.info)
+
+    @mock.patch('cms.images.MAX_SOURCE_PIXELS', 100)
+    def test_rejects_images_above_max_source_pixels(self):
+        with self.assertRaises(ValidationError):
+            normalize_upload(image_upload(Image.new('RGB', (20, 20), 'red'), 'PNG', 'logo.png'))
+
+    @mock.patch('cms.images.MAX_BYTES', 60 * 1024)
+    def test_photographic_png_over_budget_becomes_jpeg(self):
+        img, result = self.normalized(image_upload(noise((200, 200)), 'PNG', 'foto.png'))
+        self.assertEqual(img.format, 'JPEG')
+        self.assertEqual(result.name, 'foto.jpg')
+        self.assertEqual(result.content_type, 'image/jpeg')
+        self.assertLessEqual(result.size, 60 * 1024)
+
+    @mock.patch('cms.images.MAX_BYTES', 60 * 1024)
+    def test_transparent_png_over_budget_is_rejected(self):
+        # JPEG perdería la transparencia: se rechaza en lugar de convertirla
+        with self.assertRaises(ValidationError):
+            normalize_upload(image_upload(noise((200, 200), 'RGBA'), 'PNG', 'logo.png'))
+
+
+# ========== ALMACENAMIENTO POR CONTENIDO ==========
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.location = Path(tempfile.mkdtemp())
+        self.storage = ContentAddressedStorage(location=self.location, base_url='/media/')
+
+    def test_names_files_by_content_hash(self):
+        name = self.storage.save('partners/Logo Final(2).PNG', ContentFile(b'logo'))
+        digest = hashlib.sha256(b'logo').hexdigest()[:HASH_LENGTH]
+        self.assertEqual(name, f'partners/{digest}.png')
+        self.assertTrue(is_immutable_name(name))
+        self.assertFalse(is_immutable_name('partners/logo.png'))
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.storage.save('partners/a.png', ContentFile(b'logo'))
+        with mock.patch.object(FileSystemStorage, '_save') as write:
+            second = self.storage.save('partners/b.png', ContentFile(b'logo'))
+        self.assertEqual(first, second)
+        write.assert_not_called()
+        self.assertEqual(len(list((self.location / 'partners').iterdir())), 1)
+
+    def test_different_content_gets_a_new_name(self):
+        first = self.storage.save('partners/logo.png', ContentFile(b'v1'))
+        second = self.storage.save('partners/logo.png', ContentFile(b'v2'))
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.storage.open(first).read(), b'v1')
+
+
+# ========== IMÁGENES RESPONSIVE ==========
+class PreloadImageTests(TestCase):
+
+    def hero(self, formats):
+        variants = [
+            {'format': fmt, 'name': f'hero/{fmt}-800.{fmt}', 'width': 800}
+            for fmt in formats
+        ]
+        storage = mock.Mock(url=lambda name: f'/media/{name}')
+        image = mock.Mock(url='/media/hero/original.jpg', storage=storage)
+        return mock.Mock(image=image, image_meta={'fallback': 'jpeg', 'variants': variants})
+
+    def test_preloads_first_picture_source(self):
+        hero = self.hero(['webp', 'jpeg', 'avif'])
+        picture = responsive_image(hero, 'image')
+        preload = preload_image(hero, 'image')
+        self.assertLess(picture.index('image/avif'), picture.index('image/webp'))
+        self.assertIn('type="image/avif"', preload)
+        self.assertIn('/media/hero/avif-800.avif 800w', preload)
+
+    def test_preloads_fallback_without_modern_formats(self):
+        preload = preload_image(self.hero(['jpeg']), 'image')
+        self.assertIn('type="image/jpeg"', preload)
+
+
+# ========== IMÁGENES REMOTAS ==========
+def png_bytes(size=(8, 8)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Servidor de logos de prueba: /logo.png con ETag y /redirect a localhost"""
+    etag = '"logo-v1"'
+
+    def do_GET(self):
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', f'http://localhost:{self.server.server_port}/logo.png')
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RemoteImageFetchTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        cls.server.body = png_bytes()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_blocks_loopback_by_default(self):
+        with self.assertRaisesMessage(RemoteImageError, 'no permitida'):
+            fetch_remote_image(f'{self.base}/logo.png', {})
+
+    @override_settings(CMS_REMOTE_IMAGE_ALLOWED_HOSTS=['127.0.0.1'])
+    def test_fetches_and_revalidates_allowed_host(self):
+        url = f'{self.base}/logo.png'
+        upload, state = fetch_remote_image(url, {})
+        self.assertIsNotNone(upload)
+        self.assertEqual(state['etag'], StandInHandler.etag)
+
+        unchanged, state = fetch_remote_image(url, state)
+        self.assertIsNone(unchanged)
+        self.assertEqual(state['etag'], StandInHandler.etag)
+
+    @override_settings(CMS_REMOTE_IMAGE_ALLOWED_HOSTS=['127.0.0.1'])
+    def test_checks_every_redirect(self):
+        with self.assertRaisesMessage(RemoteImageError, 'no permitida'):
+            fetch_remote_image(f'{self.base}/redirect', {})
+
+    @override_settings(CMS_REMOTE_IMAGE_ALLOWED_HOSTS=['127.0.0.1'])
+    def test_decompression_bomb_is_a_fetch_error(self):
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 10):
+            with self.assertRaisesMessage(RemoteImageError, 'Imagen no válida'):
+                fetch_remote_image(f'{self.base}/logo.png', {})
+
+
+# ========== PORTADA ==========
+class HomepageTests(CMSTestCase):
+
+    def test_matching_etag_returns_304(self):
+        response = self.get_page()
+        self.assertEqual(response.status_code, 200)
+        self.get_content(response)
+
+        cached = self.get_page(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_deploy_changes_etag(self):
+        etag = self.get_page()['ETag']
+        self.addCleanup(get_build_id.cache_clear)
+        get_build_id.cache_clear()
+        with override_settings(CMS_BUILD_ID='next-deploy'):
+            response = self.get_page(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def broken_sections(self):
+        """get_template() con el <head> bien y las secciones posteriores fallando"""
+        broken = mock.Mock()
+        broken.render.side_effect = ValueError("Missing staticfiles manifest entry for 'x.css'")
+
+        def get_template(name):
+            return real_get_template(name) if name.endswith('head.html') else broken
+        return mock.patch('cms.views.get_template', side_effect=get_template)
+
+    def test_streams_head_first_and_caches_complete_page(self):
+        response = self.get_page()
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertIn('</head>', chunks[0])
+        self.assertNotIn('</head>', ''.join(chunks[1:]))
+
+        cached = self.get_page()
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached.content.decode(), ''.join(chunks))
+
+    def test_streamed_section_error_caches_nothing_and_releases_lock(self):
+        with self.broken_sections():
+            response = self.get_page()
+            self.assertEqual(response.status_code, 200)
+            with self.assertRaises(ValueError):
+                self.get_content(response)
+            response.close()
+        # Lock libre y nada cacheado: la siguiente visita vuelve a renderizar
+        request = RequestFactory().get('/')
+        self.assertTrue(acquire_index_lock(request))
+        release_index_lock(request)
+        self.assertTrue(self.get_page().streaming)
+
+    @override_settings(CMS_STREAM_INDEX=False)
+    def test_section_render_error_is_a_500_when_buffered(self):
+        self.client.raise_request_exception = False
+        with self.broken_sections():
+            response = self.get_page()
+        self.assertEqual(response.status_code, 500)
+
+    def test_snapshot_from_other_code_version_still_renders(self):
+        snapshot = HomepageSnapshot.load()
+        snapshot.data['partners'] = [{'model': 'cms.partner', 'pk': 1, 'fields': {'name': 'Marca', 'retired': 1}}]
+        del snapshot.data['seo']
+        snapshot.save()
+        response = self.get_page()
+        self.assertEqual(response.status_code, 200)
+
+    def test_public_get_does_not_write_the_snapshot(self):
+        HomepageSnapshot.objects.all().delete()
+        response = self.get_page()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(HomepageSnapshot.objects.exists())
+
+    def test_last_modified_moves_forward_after_delete(self):
+        with self.publishing():
+            partner = Partner.objects.create(name='Marca')
+        created = HomepageSnapshot.load().last_modified
+        with self.publishing():
+            partner.delete()
+        deleted = HomepageSnapshot.load().last_modified
+        self.assertGreater(deleted, created)
+
+        response = self.get_page(HTTP_IF_MODIFIED_SINCE=http_date(created.timestamp()))
+        self.assertEqual(response.status_code, 200)
+
+    def test_database_error_serves_last_rendered_page(self):
+        content = self.get_content(self.get_page())
+        # Contenido nuevo y base de datos bloqueada al renderizarlo
+        bump_content_version()
+        with mock.patch('cms.views.HomepageSnapshot.load', side_effect=OperationalError('database is locked')):
+            response = self.get_page()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'STALE')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertEqual(self.get_content(response), content)
+
+    def test_database_error_without_stale_page_is_a_500(self):
+        self.client.raise_request_exception = False
+        with mock.patch('cms.views.HomepageSnapshot.load', side_effect=OperationalError('database is locked')):
+            response = self.get_page()
+        self.assertEqual(response.status_code, 500)
+
+
+    def test_publish_during_render_does_not_cache_old_fragment_as_new(self):
+        with self.publishing():
+            service = Service.objects.create(title='Servicio OLD', description='-')
+        real_load = HomepageSnapshot.load
+        renamed = []
+
+        def load_then_publish():
+            # Otro worker publica un cambio justo después de leer el snapshot
+            snapshot = real_load()
+            if not renamed:
+                renamed.append(True)
+                Service.objects.filter(pk=service.pk).update(title='Servicio NEW')
+                publish_content(models=(Service,))
+            return snapshot
+
+        with mock.patch.object(HomepageSnapshot, 'load', side_effect=load_then_publish):
+            self.assertIn('Servicio OLD', self.get_content(self.get_page()))
+        content = self.get_content(self.get_page())
+        self.assertIn('Servicio NEW', content)
+        self.assertNotIn('Servicio OLD', content)
+
+    def test_publishing_one_model_rerenders_only_its_fragment(self):
+        with self.publishing():
+            service = Service.objects.create(title='Servicio A', description='-')
+            partner = Partner.objects.create(name='Marca A')
+        self.get_content(self.get_page())
+
+        # Ambos cambian en la base de datos, pero solo se publican las marcas:
+        # la sección de servicios sigue saliendo de su fragmento cacheado
+        Service.objects.filter(pk=service.pk).update(title='Servicio B')
+        Partner.objects.filter(pk=partner.pk).update(name='Marca B')
+        HomepageSnapshot.publish()
+        bump_model_versions(['cms.partner'])
+        bump_content_version()
+
+        content = self.get_content(self.get_page())
+        self.assertIn('Marca B', content)
+        self.assertIn('Servicio A', content)
+
+
+# ========== BLOQUE SEO ==========
+class SEOHeadTests(CMSTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.publishing():
+            SEOConfig.objects.create(pk=1, meta_title='Título actual')
+        self.request = RequestFactory().get('/')
+
+    def render(self, seo):
+        return render_seo_head(seo, SiteConfig(), ContactInfo(), self.request)
+
+    def test_fragment_from_another_build_is_rendered_again(self):
+        seo = SEOConfig.objects.get(pk=1)
+        self.assertEqual(seo.head_fragment_build, get_build_id())
+        self.assertIn('Título actual', self.render(seo))
+
+        seo.head_fragment = '<title>Plantilla anterior</title>'
+        self.assertIn('Plantilla anterior', self.render(seo))
+        seo.head_fragment_build = 'previous-deploy'
+        self.assertNotIn('Plantilla anterior', self.render(seo))
+        self.assertIn('Título actual', self.render(seo))
+
+    def test_migrate_republishes_stale_fragment_without_pending_migrations(self):
+        SEOConfig.objects.filter(pk=1).update(
+            head_fragment='<title>Plantilla anterior</title>', head_fragment_build='previous-deploy',
+        )
+        HomepageSnapshot.publish()
+        publish_after_migrate(sender=None, plan=[])
+
+        seo = SEOConfig.objects.get(pk=1)
+        self.assertEqual(seo.head_fragment_build, get_build_id())
+        self.assertIn('Título actual', seo.head_fragment)
+        snapshot_seo = HomepageSnapshot.load().data['seo'][0]['fields']
+        self.assertEqual(snapshot_seo['head_fragment'], seo.head_fragment)
+
+# ========== CONFIGURACIÓN MEMOIZADA ==========
+class LoadCachedTests(CMSTestCase):
+
+    def test_missing_row_returns_defaults_without_writing(self):
+        config = SiteConfig.load_cached()
+        self.assertEqual(config.pk, 1)
+        self.assertFalse(SiteConfig.objects.exists())
+
+    def test_memoized_until_config_version_changes(self):
+        SiteConfig.objects.create(pk=1, site_title='Antes')
+        self.assertEqual(SiteConfig.load_cached().site_title, 'Antes')
+
+        # update() no publica: el proceso sigue con la instancia memoizada
+        SiteConfig.objects.filter(pk=1).update(site_title='Después')
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteConfig.load_cached().site_title, 'Antes')
+
+        bump_config_version()
+        self.assertEqual(SiteConfig.load_cached().site_title, 'Después')
+
+    def test_saving_a_singleton_refreshes_the_memo(self):
+        config = SiteConfig.objects.create(pk=1, site_title='Antes')
+        SiteConfig.load_cached()
+        with self.publishing():
+            config.site_title = 'Después'
+            config.save()
+        self.assertEqual(SiteConfig.load_cached().site_title, 'Después')
+
+# ========== TEMA DE COLORES ==========
+class ThemeTests(CMSTestCase):
+
+    def test_shade_ramp_keeps_base_at_500_and_darkens_upwards(self):
+        ramp = shade_ramp('#2a9dff')
+        self.assertEqual(list(ramp), list(SHADES))
+        self.assertEqual(ramp[500], '#2a9dff')
+        self.assertEqual(shade_ramp('#29f')[500], '#2299ff')
+        luminance = [sum(int(value[i:i + 2], 16) for i in (1, 3, 5)) for value in ramp.values()]
+        self.assertEqual(luminance, sorted(luminance, reverse=True))
+
+    def test_shade_ramp_rejects_non_hex_colors(self):
+        with self.assertRaises(ValueError):
+            shade_ramp('blue')
+
+    def test_publish_theme_writes_a_new_file_only_when_colors_change(self):
+        config = SiteConfig(pk=1, primary_color='#2a9dff', accent_color='#00c9b7')
+        self.assertTrue(publish_theme(config))
+        name = config.theme_stylesheet.name
+        self.assertTrue(is_immutable_name(name))
+        css = config.theme_stylesheet.read().decode()
+        config.theme_stylesheet.close()
+        self.assertIn('--color-primary-500:#2a9dff', css)
+        self.assertIn('--color-accent-950:', css)
+
+        self.assertFalse(publish_theme(config))
+        config.primary_color = '#ff0000'
+        self.assertTrue(publish_theme(config))
+        self.assertNotEqual(config.theme_stylesheet.name, name)
+
+    def test_saving_site_config_updates_the_stylesheet(self):
+        with self.publishing():
+            config = SiteConfig.objects.create(pk=1, primary_color='#2a9dff', accent_color='#00c9b7')
+        first = SiteConfig.objects.get(pk=1).theme_stylesheet.name
+        self.assertTrue(first)
+        with self.publishing():
+            config.primary_color = '#ff0000'
+            config.save()
+        self.assertNotEqual(SiteConfig.objects.get(pk=1).theme_stylesheet.name, first)
+
+# ========== CONTADORES ==========
+class CounterTests(CMSTestCase):
+
+    def total(self, model=Service):
+        return Counter.totals((model,))[model._meta.label_lower]
+
+    def test_totals_follow_create_delete_and_bulk_delete(self):
+        self.assertEqual(self.total(), 0)
+        with self.publishing():
+            services = [Service.objects.create(title=f'Servicio {i}', description='-') for i in range(4)]
+        pks = [service.pk for service in services]
+        self.assertEqual(self.total(), 4)
+
+        with self.publishing():
+            services[0].delete()
+        self.assertEqual(self.total(), 3)
+
+        # La fila ya eliminada no se descuenta dos veces
+        with self.publishing():
+            self.assertEqual(run_bulk_action(Service, 'delete', pks), 3)
+        self.assertEqual(self.total(), 0)
+        self.assertEqual(self.total(), Service.objects.count())
+
+    def test_rolled_back_create_is_not_counted(self):
+        self.assertEqual(self.total(User), 0)
+        with self.assertRaises(ValueError), transaction.atomic():
+            User.objects.create_user('editor', password='x')
+            raise ValueError
+        self.assertEqual(self.total(User), 0)
+
+
+# ========== PUBLICACIÓN AGRUPADA ==========
+class CoalescedPublishTests(CMSTestCase):
+
+    def publish_calls(self, block):
+        with mock.patch('cms.signals.publish_content') as publish, self.publishing():
+            block()
+        return publish.call_args_list
+
+    def test_one_publish_per_transaction(self):
+        def save_rows():
+            with transaction.atomic():
+                for i in range(5):
+                    Service.objects.create(title=f'Servicio {i}', description='-')
+                Service.objects.filter(title='Servicio 0').first().delete()
+
+        calls = self.publish_calls(save_rows)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].kwargs['models'], (Service,))
+
+    def test_one_publish_per_request_across_models(self):
+        def save_rows():
+            # Lo que hace CoalesceInvalidationMiddleware con cada petición
+            with coalesce():
+                Service.objects.create(title='Servicio', description='-')
+                Partner.objects.create(name='Marca')
+
+        calls = self.publish_calls(save_rows)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(calls[0].kwargs['models']), {Service, Partner})
+
+
+
+@override_settings(CACHES=TEST_CACHES, CMS_LOCK_DIR=tempfile.mkdtemp(), CMS_WARM_INDEX=False)
+class PublishFailureTests(TransactionTestCase):
+    """Publicación tras un COMMIT real (on_commit corre de verdad)"""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('editor', password='x'))
+
+    def test_failed_publish_keeps_the_save_and_retries(self):
+        version = get_content_version()
+        data = {'title': 'Climatización', 'description': '-', 'icon': 'fa-solid fa-fan', 'order': 1, 'active': 'on'}
+        with mock.patch.object(HomepageSnapshot, 'publish', side_effect=OperationalError('database is locked')), \
+                self.assertLogs('cms.invalidation', 'ERROR'):
+            response = self.client.post('/panel-admin/services/create/', data)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Service.objects.filter(title='Climatización').exists())
+        self.assertEqual(get_content_version(), version)
+
+        # La próxima petición de este hilo publica lo pendiente
+        self.client.get('/panel-admin/')
+        self.assertNotEqual(get_content_version(), version)
+        services = HomepageSnapshot.load().data['services']
+        self.assertEqual([row['fields']['title'] for row in services], ['Climatización'])
+
+# ========== ACCIONES MASIVAS ==========
+class BulkActionTests(CMSTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Publicadas aquí: no deben sumarse a la publicación de la acción
+        with self.publishing():
+            self.pks = [
+                Service.objects.create(title=f'Servicio {i}', description='-').pk
+                for i in range(5)
+            ]
+            self.client.force_login(User.objects.create_user('editor', password='x'))
+
+    def post(self, action, pks):
+        with mock.patch('cms.signals.publish_content') as publish, self.publishing():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/panel-admin/services/bulk/', {'action': action, 'pk': pks})
+        service_queries = [query['sql'] for query in queries if '"cms_service"' in query['sql']]
+        return response, service_queries, publish
+
+    def test_update_is_one_query_and_one_publish(self):
+        response, service_queries, publish = self.post('deactivate', self.pks[:3])
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(service_queries), 1)
+        self.assertTrue(service_queries[0].startswith('UPDATE'))
+        publish.assert_called_once()
+        self.assertEqual(Service.objects.filter(active=False).count(), 3)
+
+    def test_delete_is_one_query_and_one_publish(self):
+        response, service_queries, publish = self.post('delete', self.pks[:3])
+        self.assertEqual(len(service_queries), 1)
+        self.assertTrue(service_queries[0].startswith('DELETE'))
+        publish.assert_called_once()
+        self.assertEqual(Service.objects.count(), 2)
+
+    def test_invalid_action_changes_nothing(self):
+        response, service_queries, publish = self.post('drop', self.pks)
+        self.assertEqual(service_queries, [])
+        publish.assert_not_called()
+
+
+# ========== PRECALENTAMIENTO ==========
+class WarmIndexTests(CMSTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Primera visita: registra el dominio y deja la portada cacheada
+        self.old = self.get_content(self.get_page())
+        with self.publishing():
+            Service.objects.create(title='Servicio nuevo', description='-')
+        self.request = RequestFactory().get('/')
+
+    def test_warms_the_new_generation_for_served_origins(self):
+        self.assertIsNone(get_index_page(self.request))
+        warm_index_cache()
+        self.assertIn('Servicio nuevo', get_index_page(self.request))
+        response = self.get_page()
+        self.assertFalse(response.streaming)
+        self.assertIn('Servicio nuevo', response.content.decode())
+
+    def test_serves_stale_page_while_another_worker_renders(self):
+        self.assertTrue(acquire_index_lock(self.request))
+        self.addCleanup(release_index_lock, self.request)
+
+        response = self.get_page()
+        self.assertEqual(response['X-Cache'], 'STALE')
+        self.assertEqual(self.get_content(response), self.old)
+        # El precalentamiento tampoco renderiza: ese worker ya lo está haciendo
+        warm_index_cache()
+        self.assertIsNone(get_index_page(self.request))
+
+    def test_background_task_closes_its_connections(self):
+        # Aunque la tarea falle (el hilo reporta la excepción y termina)
+        with mock.patch('cms.tasks.connections') as connections, \
+                mock.patch('threading.excepthook') as excepthook:
+            run_in_background(mock.Mock(side_effect=DatabaseError)).join()
+        connections.close_all.assert_called_once_with()
+        excepthook.assert_called_once()
+
+
+# ========== PAGINACIÓN ==========
+class KeysetPaginationTests(CMSTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Claves de orden repetidas de a tres: el pk desempata
+        for i in range(7):
+            Service.objects.create(title=f'Servicio {i}', description='-', order=i // 3)
+        self.factory = RequestFactory()
+
+    def page(self, params=''):
+        return keyset_page(
+            self.factory.get('/' + params), Service.objects.all(),
+            sort_fields=('title', 'order'), default_sort='order',
+            search_fields=('title',), counted=True, per_page=2,
+        )
+
+    def walk(self, params=''):
+        page = self.page(params)
+        pages = [[service.pk for service in page]]
+        while page.has_next:
+            page = self.page(page.next_url)
+            pages.append([service.pk for service in page])
+        return pages, page
+
+    def test_next_pages_follow_orm_order_with_ties(self):
+        for sort, ordering in (('order', ('order', 'pk')), ('-order', ('-order', '-pk'))):
+            pages, _ = self.walk(f'?sort={sort}')
+            expected = list(Service.objects.order_by(*ordering).values_list('pk', flat=True))
+            self.assertEqual(sum(pages, []), expected)
+            self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+    def test_previous_pages_mirror_next_pages(self):
+        pages, page = self.walk()
+        back = []
+        while page.has_previous:
+            page = self.page(page.previous_url)
+            back.insert(0, [service.pk for service in page])
+        self.assertEqual(back, pages[:-1])
+
+    def test_total_comes_from_counter_and_searches_have_none(self):
+        self.assertEqual(self.page().total, 7)
+        page = self.page('?q=SERVICIO%201')
+        self.assertIsNone(page.total)
+        self.assertEqual([service.title for service in page], ['Servicio 1'])
+        # Coincide con el comienzo del título, no con una parte cualquiera
+        self.assertEqual(list(self.page('?q=vicio')), [])
+
+
+# ========== ORDEN MANUAL ==========
+class OrderingTests(CMSTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.services = [
+            Service.objects.create(title=f'Servicio {i}', description='-', order=order)
+            for i, order in enumerate((10, 11, 20))
+        ]
+
+    def orders(self):
+        return list(Service.objects.order_by('order', 'pk').values_list('pk', 'order'))
+
+    def test_key_between(self):
+        self.assertEqual(key_between(None, None), ORDER_GAP)
+        self.assertEqual(key_between(None, 10), 10 - ORDER_GAP)
+        self.assertEqual(key_between(10, None), 10 + ORDER_GAP)
+        self.assertEqual(key_between(10, 20), 15)
+        self.assertEqual(key_between(10, 12), 11)
+        self.assertIsNone(key_between(10, 11))
+        self.assertIsNone(key_between(10, 10))
+
+    def test_move_into_gap_writes_only_that_row(self):
+        first, second, third = self.services
+        order = move(Service, first.pk, previous=second.pk)
+        self.assertEqual(order, 15)
+        self.assertEqual(self.orders(), [(second.pk, 11), (first.pk, 15), (third.pk, 20)])
+
+    def test_move_without_gap_rebalances(self):
+        first, second, third = self.services
+        move(Service, third.pk, previous=first.pk, following=second.pk)
+        pks = [pk for pk, _ in self.orders()]
+        self.assertEqual(pks, [first.pk, third.pk, second.pk])
+        orders = [order for _, order in self.orders()]
+        self.assertTrue(all(hi - lo >= 2 for lo, hi in zip(orders, orders[1:])))
+
+    def test_rebalance_keeps_order_and_breaks_ties_by_pk(self):
+        Service.objects.filter(pk=self.services[2].pk).update(order=10)
+        expected = [pk for pk, _ in self.orders()]
+        self.assertTrue(rebalance(Service))
+        self.assertEqual(self.orders(), [(pk, i * ORDER_GAP) for i, pk in enumerate(expected, 1)])
+        self.assertFalse(rebalance(Service))
+
+    def test_invalid_move_returns_fixed_message(self):
+        self.client.force_login(User.objects.create_user('editor', password='x'))
+        first, second, third = (service.pk for service in self.services)
+        for data in (
+            {'pk': "1'; DROP"},
+            {'pk': first},
+            {'pk': first, 'next': 999},
+            # Vecinas invertidas: otro editor reordenó o la página está vieja
+            {'pk': first, 'previous': third, 'next': second},
+        ):
+            response = self.client.post('/panel-admin/services/reorder/', data)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'error': 'Movimiento no válido'})
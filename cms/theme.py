@@ -0,0 +1,53 @@
+"""
+Tema de colores del sitio de AC Technology
+Genera la hoja de variables CSS a partir de los colores de SiteConfig
+"""
+from django.core.files.base import ContentFile
+
+from .utility_css import SHADES, _hex_to_rgb
+
+
+# Proporción de blanco (tonos claros) o negro (tonos oscuros) mezclada con
+# el color base: 500 es siempre el color elegido
+SHADE_MIX = {
+    50: ('#ffffff', .95), 100: ('#ffffff', .9), 200: ('#ffffff', .75), 300: ('#ffffff', .55),
+    400: ('#ffffff', .3), 500: (None, 0), 600: ('#000000', .15), 700: ('#000000', .32),
+    800: ('#000000', .48), 900: ('#000000', .6), 950: ('#000000', .75),
+}
+
+
+def _mix(color, other, amount):
+    return tuple(round(c + (o - c) * amount) for c, o in zip(color, other))
+
+
+def shade_ramp(color):
+    """Escala 50–950 de un color #rrggbb"""
+    base = _hex_to_rgb(color)
+    ramp = {}
+    for shade in SHADES:
+        other, amount = SHADE_MIX[shade]
+        rgb = _mix(base, _hex_to_rgb(other), amount) if other else base
+        ramp[shade] = '#%02x%02x%02x' % rgb
+    return ramp
+
+
+def theme_css(site_config):
+    """Variables --color-primary-* y --color-accent-* del sitio"""
+    variables = ';'.join(
+        f'--color-{name}-{shade}:{value}'
+        for name, color in (('primary', site_config.primary_color), ('accent', site_config.accent_color))
+        for shade, value in shade_ramp(color).items()
+    )
+    return f':root{{{variables}}}\n'
+
+
+def publish_theme(site_config):
+    """Guarda la hoja del tema con el hash de su contenido como nombre
+
+    Retorna True si cambió el archivo referenciado por la configuración.
+    """
+    previous = site_config.theme_stylesheet.name
+    field_file = site_config.theme_stylesheet
+    # El storage direccionado por contenido reutiliza el archivo si ya existe
+    field_file.save('theme.css', ContentFile(theme_css(site_config).encode()), save=False)
+    return field_file.name != previous
@@ -1,9 +1,10 @@
 """
 URLs para la aplicación CMS
 """
-from django.urls import path
+from django.urls import path, reverse_lazy
 from django.contrib.auth import views as auth_views
 from . import views
+from .models import Service, Partner, Project
 
 urlpatterns = [
     # ========== PÁGINA PRINCIPAL (PÚBLICA) ==========
@@ -29,18 +30,24 @@ urlpatterns = [
 
     # ========== SERVICIOS ==========
     path('panel-admin/services/', views.ServiceListView.as_view(), name='service_list'),
+    path('panel-admin/services/bulk/', views.BulkActionView.as_view(model=Service, success_url=reverse_lazy('service_list')), name='service_bulk'),
+    path('panel-admin/services/reorder/', views.ReorderView.as_view(model=Service), name='service_reorder'),
     path('panel-admin/services/create/', views.ServiceCreateView.as_view(), name='service_create'),
     path('panel-admin/services/<int:pk>/edit/', views.ServiceUpdateView.as_view(), name='service_edit'),
     path('panel-admin/services/<int:pk>/delete/', views.ServiceDeleteView.as_view(), name='service_delete'),
 
     # ========== MARCAS ==========
     path('panel-admin/partners/', views.PartnerListView.as_view(), name='partner_list'),
+    path('panel-admin/partners/bulk/', views.BulkActionView.as_view(model=Partner, success_url=reverse_lazy('partner_list')), name='partner_bulk'),
+    path('panel-admin/partners/reorder/', views.ReorderView.as_view(model=Partner), name='partner_reorder'),
     path('panel-admin/partners/create/', views.PartnerCreateView.as_view(), name='partner_create'),
     path('panel-admin/partners/<int:pk>/edit/', views.PartnerUpdateView.as_view(), name='partner_edit'),
     path('panel-admin/partners/<int:pk>/delete/', views.PartnerDeleteView.as_view(), name='partner_delete'),
 
     # ========== PROYECTOS ==========
     path('panel-admin/projects/', views.ProjectListView.as_view(), name='project_list'),
+    path('panel-admin/projects/bulk/', views.BulkActionView.as_view(model=Project, success_url=reverse_lazy('project_list')), name='project_bulk'),
+    path('panel-admin/projects/reorder/', views.ReorderView.as_view(model=Project), name='project_reorder'),
     path('panel-admin/projects/create/', views.ProjectCreateView.as_view(), name='project_create'),
     path('panel-admin/projects/<int:pk>/edit/', views.ProjectUpdateView.as_view(), name='project_edit'),
     path('panel-admin/projects/<int:pk>/delete/', views.ProjectDeleteView.as_view(), name='project_delete'),
@@ -0,0 +1,617 @@
+"""
+Generador de CSS utilitario para las plantillas del CMS de AC Technology
+Reemplaza el compilador de Tailwind del CDN por una hoja estática mínima
+con solo las clases que realmente usan las plantillas
+"""
+import re
+from fractions import Fraction
+from pathlib import Path
+
+from django.conf import settings
+
+
+# ========== TEMA (antes en el tailwind.config inline) ==========
+# Los colores del tema se exponen como variables CSS (--color-primary-500...)
+# para que la configuración del sitio pueda reemplazarlos sin recompilar
+THEME_COLORS = {
+    'primary': {
+        50: '#eef7ff', 100: '#d9eeff', 200: '#bce1ff', 300: '#8fd0ff', 400: '#5ab9ff', 500: '#2a9dff',
+        600: '#107fe6', 700: '#0a65b8', 800: '#0a4d8a', 900: '#0b4070', 950: '#072b4b',
+    },
+    'accent': {
+        50: '#ecfffb', 100: '#c5fff3', 200: '#8affea', 300: '#4df9dd', 400: '#1ce5cd', 500: '#00c9b7',
+        600: '#00a398', 700: '#047a74', 800: '#0a5f5c', 900: '#0b4f4d', 950: '#042f30',
+    },
+}
+
+FONT_FAMILIES = {
+    'sans': '"Plus Jakarta Sans",Inter,system-ui,-apple-system,"Segoe UI",Roboto,Ubuntu,Cantarell,"Noto Sans",sans-serif',
+    'display': 'Poppins,Inter,system-ui,sans-serif',
+    'mono': 'ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace',
+}
+
+BOX_SHADOWS = {
+    '': '0 1px 3px 0 rgb(0 0 0 / .1),0 1px 2px -1px rgb(0 0 0 / .1)',
+    'sm': '0 1px 2px 0 rgb(0 0 0 / .05)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / .1),0 2px 4px -2px rgb(0 0 0 / .1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / .1),0 4px 6px -4px rgb(0 0 0 / .1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / .1),0 8px 10px -6px rgb(0 0 0 / .1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / .25)',
+    'none': '0 0 #0000',
+    'soft': '0 10px 30px rgba(0,0,0,0.08)',
+}
+
+# Paleta por defecto de Tailwind (solo las familias que usa el sitio)
+PALETTE = {
+    'slate': ['#f8fafc', '#f1f5f9', '#e2e8f0', '#cbd5e1', '#94a3b8', '#64748b', '#475569', '#334155', '#1e293b', '#0f172a', '#020617'],
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827', '#030712'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d', '#450a0a'],
+    'orange': ['#fff7ed', '#ffedd5', '#fed7aa', '#fdba74', '#fb923c', '#f97316', '#ea580c', '#c2410c', '#9a3412', '#7c2d12', '#431407'],
+    'yellow': ['#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12', '#422006'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d', '#052e16'],
+    'teal': ['#f0fdfa', '#ccfbf1', '#99f6e4', '#5eead4', '#2dd4bf', '#14b8a6', '#0d9488', '#0f766e', '#115e59', '#134e4a', '#042f2e'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'],
+    'purple': ['#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87', '#3b0764'],
+}
+SHADES = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+
+FONT_SIZES = {
+    'xs': ('.75rem', '1rem'), 'sm': ('.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'),
+}
+LINE_HEIGHTS = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+FONT_WEIGHTS = {'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700', 'extrabold': '800'}
+TRACKING = {'tighter': '-.05em', 'tight': '-.025em', 'normal': '0', 'wide': '.025em', 'wider': '.05em', 'widest': '.1em'}
+RADII = {'none': '0', 'sm': '.125rem', '': '.25rem', 'md': '.375rem', 'lg': '.5rem', 'xl': '.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+MAX_WIDTHS = {
+    'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem', '2xl': '42rem', '3xl': '48rem',
+    '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem', 'full': '100%', 'none': 'none',
+}
+GRADIENT_DIRECTIONS = {
+    't': 'top', 'tr': 'top right', 'r': 'right', 'br': 'bottom right',
+    'b': 'bottom', 'bl': 'bottom left', 'l': 'left', 'tl': 'top left',
+}
+
+# Archivos donde se buscan clases (como el "content" de tailwind.config)
+CONTENT_GLOBS = ('cms/templates/**/*.html', 'cms/templatetags/*.py', 'assets/reorder.js', 'assets/bulk.js')
+
+# Candidatos a clase dentro de HTML, plantillas y strings de Python
+CANDIDATE_RE = re.compile(r'''[^\s"'`<>{}(),=]+''')
+# Valores de class="..." (y css_class= de los tags) y clases que agrega el JS
+CLASS_ATTR_RE = re.compile(r'''\b(?:class|css_class|className)\s*=\s*(["'])(.*?)\1''', re.S)
+CLASS_LIST_RE = re.compile(r'''classList\.\w+\(([^)]*)\)''')
+TEMPLATE_TAG_RE = re.compile(r'{[%{].*?[%}]}', re.S)
+# Clases con guion o variante que no son utilitarias: íconos y hojas propias
+IGNORED_CLASS_PREFIXES = ('fa-',)
+STYLESHEETS = ('assets/styles.css',)
+
+CHILD_SELECTOR = ' > :not([hidden]) ~ :not([hidden])'
+
+BOX_SHADOW = 'var(--tw-ring-offset-shadow,0 0 #0000),var(--tw-ring-shadow,0 0 #0000),var(--tw-shadow,0 0 #0000)'
+
+
+# ========== VALORES ==========
+def _spacing(value, negative=False):
+    """Escala de espaciado: 4 -> 1rem, 1/2 -> 50%, full, px, auto..."""
+    named = {'px': '1px', 'full': '100%', 'auto': 'auto', '0': '0px'}
+    if value in named:
+        result = named[value]
+    elif re.fullmatch(r'\d+/\d+', value):
+        result = f'{float(Fraction(value)) * 100:g}%'
+    elif re.fullmatch(r'\d+(\.\d+)?', value):
+        result = f'{float(value) / 4:g}rem'
+    elif value.startswith('[') and value.endswith(']'):
+        result = value[1:-1].replace('_', ' ')
+    else:
+        return None
+    if negative and result not in ('auto', '0px'):
+        result = f'calc({result} * -1)' if result.startswith('calc') else f'-{result}'
+    return result
+
+
+def _hex_to_rgb(value):
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _color(token):
+    """slate-200, white, primary-600, [#25D366], con /NN de opacidad opcional"""
+    name, _, alpha = token.partition('/')
+    if alpha and not alpha.isdigit():
+        return None
+    alpha = int(alpha) / 100 if alpha else None
+
+    if name in ('transparent', 'current', 'inherit'):
+        return None if alpha is not None else {'current': 'currentColor'}.get(name, name)
+
+    family, _, shade = name.rpartition('-')
+    if family in THEME_COLORS and shade.isdigit() and int(shade) in THEME_COLORS[family]:
+        variable = f'var(--color-{family}-{shade})'
+        if alpha is None:
+            return variable
+        return f'color-mix(in srgb,{variable} {alpha * 100:g}%,transparent)'
+
+    if name == 'white':
+        rgb = (255, 255, 255)
+    elif name == 'black':
+        rgb = (0, 0, 0)
+    elif re.fullmatch(r'\[#[0-9a-fA-F]{3,6}\]', name):
+        rgb = _hex_to_rgb(name[1:-1])
+    elif family in PALETTE and shade.isdigit() and int(shade) in SHADES:
+        rgb = _hex_to_rgb(PALETTE[family][SHADES.index(int(shade))])
+    else:
+        return None
+    channels = ' '.join(str(c) for c in rgb)
+    return f'rgb({channels} / {alpha:g})' if alpha is not None else f'rgb({channels})'
+
+
+# ========== UTILIDADES ==========
+# Clases fijas (sin valor), en el orden en que se emiten
+STATIC_UTILITIES = {
+    'container': 'width:100%',
+    'absolute': 'position:absolute', 'relative': 'position:relative', 'fixed': 'position:fixed',
+    'sticky': 'position:sticky', 'static': 'position:static',
+    'block': 'display:block', 'inline-block': 'display:inline-block', 'inline': 'display:inline',
+    'flex': 'display:flex', 'inline-flex': 'display:inline-flex', 'grid': 'display:grid',
+    'hidden': 'display:none', 'table': 'display:table',
+    'flex-1': 'flex:1 1 0%', 'flex-auto': 'flex:1 1 auto', 'flex-none': 'flex:none',
+    'flex-shrink-0': 'flex-shrink:0', 'shrink-0': 'flex-shrink:0', 'flex-grow': 'flex-grow:1',
+    'flex-row': 'flex-direction:row', 'flex-col': 'flex-direction:column',
+    'flex-wrap': 'flex-wrap:wrap', 'flex-nowrap': 'flex-wrap:nowrap',
+    'items-start': 'align-items:flex-start', 'items-center': 'align-items:center',
+    'items-end': 'align-items:flex-end', 'items-stretch': 'align-items:stretch',
+    'justify-start': 'justify-content:flex-start', 'justify-center': 'justify-content:center',
+    'justify-end': 'justify-content:flex-end', 'justify-between': 'justify-content:space-between',
+    'place-items-center': 'place-items:center',
+    'overflow-hidden': 'overflow:hidden', 'overflow-auto': 'overflow:auto',
+    'overflow-x-auto': 'overflow-x:auto', 'overflow-y-auto': 'overflow-y:auto',
+    'scroll-smooth': 'scroll-behavior:smooth',
+    'whitespace-nowrap': 'white-space:nowrap',
+    'truncate': 'overflow:hidden;text-overflow:ellipsis;white-space:nowrap',
+    'text-left': 'text-align:left', 'text-center': 'text-align:center', 'text-right': 'text-align:right',
+    'uppercase': 'text-transform:uppercase', 'lowercase': 'text-transform:lowercase', 'capitalize': 'text-transform:capitalize',
+    'underline': 'text-decoration-line:underline', 'no-underline': 'text-decoration-line:none',
+    'antialiased': '-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale',
+    'object-contain': 'object-fit:contain', 'object-cover': 'object-fit:cover',
+    'aspect-square': 'aspect-ratio:1 / 1', 'aspect-video': 'aspect-ratio:16 / 9',
+    'h-screen': 'height:100vh', 'min-h-screen': 'min-height:100vh', 'w-screen': 'width:100vw',
+    'backdrop-blur-sm': 'backdrop-filter:blur(4px)', 'backdrop-blur': 'backdrop-filter:blur(8px)',
+    'transition': (
+        'transition-property:color,background-color,border-color,text-decoration-color,fill,stroke,'
+        'opacity,box-shadow,transform,translate,scale,filter,backdrop-filter;'
+        'transition-timing-function:cubic-bezier(.4,0,.2,1);transition-duration:.15s'
+    ),
+    'cursor-pointer': 'cursor:pointer', 'cursor-move': 'cursor:move', 'select-none': 'user-select:none',
+    'outline-none': 'outline:2px solid transparent;outline-offset:2px',
+    'pointer-events-none': 'pointer-events:none',
+}
+
+
+def _u_inset(m):
+    negative, side, value = m.groups()
+    value = _spacing(value, bool(negative))
+    if value is None:
+        return None
+    props = {'inset': ('top', 'right', 'bottom', 'left'), 'inset-x': ('left', 'right'), 'inset-y': ('top', 'bottom')}
+    return ';'.join(f'{p}:{value}' for p in props.get(side, (side,)))
+
+
+def _u_z(m):
+    negative, value = m.groups()
+    return f'z-index:{"-" if negative else ""}{value}'
+
+
+def _u_translate(m):
+    negative, axis, value = m.groups()
+    value = _spacing(value, bool(negative))
+    if value is None:
+        return None
+    return f'translate:{value} 0' if axis == 'x' else f'translate:0 {value}'
+
+
+def _u_scale(m):
+    return f'scale:{int(m.group(1)) / 100:g}'
+
+
+def _box_property(prefix, m):
+    negative, side, value = m.groups()
+    value = _spacing(value, bool(negative))
+    if value is None:
+        return None
+    sides = {
+        '': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'),
+        't': ('-top',), 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',),
+    }[side]
+    return ';'.join(f'{prefix}{s}:{value}' for s in sides)
+
+
+def _u_size(m):
+    prop, value = m.groups()
+    props = {'w': 'width', 'h': 'height', 'min-w': 'min-width', 'min-h': 'min-height', 'max-h': 'max-height', 'max-w': 'max-width'}
+    if prop == 'max-w':
+        css = MAX_WIDTHS.get(value)
+    else:
+        css = _spacing(value)
+    return f'{props[prop]}:{css}' if css else None
+
+
+def _u_gap(m):
+    axis, value = m.groups()
+    value = _spacing(value)
+    if value is None:
+        return None
+    prop = {'': 'gap', '-x': 'column-gap', '-y': 'row-gap'}[axis or '']
+    return f'{prop}:{value}'
+
+
+def _u_space(m):
+    axis, value = m.groups()
+    value = _spacing(value)
+    if value is None:
+        return None
+    side = 'top' if axis == 'y' else 'left'
+    return f'margin-{side}:{value}', CHILD_SELECTOR
+
+
+def _u_grid_cols(m):
+    return f'grid-template-columns:repeat({m.group(1)},minmax(0,1fr))'
+
+
+def _u_col_span(m):
+    return f'grid-column:span {m.group(1)} / span {m.group(1)}'
+
+
+def _u_text(m):
+    value = m.group(1)
+    size, _, leading = value.partition('/')
+    if size in FONT_SIZES:
+        font_size, line_height = FONT_SIZES[size]
+        if leading:
+            line_height = LINE_HEIGHTS.get(leading) or _spacing(leading)
+            if line_height is None:
+                return None
+        return f'font-size:{font_size};line-height:{line_height}'
+    color = _color(value)
+    return f'color:{color}' if color else None
+
+
+def _u_font(m):
+    value = m.group(1)
+    if value in FONT_WEIGHTS:
+        return f'font-weight:{FONT_WEIGHTS[value]}'
+    if value in FONT_FAMILIES:
+        return f'font-family:{FONT_FAMILIES[value]}'
+    return None
+
+
+def _u_leading(m):
+    value = LINE_HEIGHTS.get(m.group(1)) or _spacing(m.group(1))
+    return f'line-height:{value}' if value else None
+
+
+def _u_tracking(m):
+    value = TRACKING.get(m.group(1))
+    return f'letter-spacing:{value}' if value else None
+
+
+def _u_bg(m):
+    color = _color(m.group(1))
+    return f'background-color:{color}' if color else None
+
+
+def _u_gradient(m):
+    direction = GRADIENT_DIRECTIONS.get(m.group(1))
+    return f'background-image:linear-gradient(to {direction},var(--tw-gradient-stops))' if direction else None
+
+
+def _u_from(m):
+    color = _color(m.group(1))
+    if not color:
+        return None
+    return (
+        f'--tw-gradient-from:{color};--tw-gradient-to:transparent;'
+        '--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)'
+    )
+
+
+def _u_via(m):
+    color = _color(m.group(1))
+    if not color:
+        return None
+    return f'--tw-gradient-stops:var(--tw-gradient-from),{color},var(--tw-gradient-to)'
+
+
+def _u_to(m):
+    color = _color(m.group(1))
+    return f'--tw-gradient-to:{color}' if color else None
+
+
+def _u_border_width(m):
+    side, width = m.groups()
+    width = f'{width or 1}px'
+    sides = {'': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'), 't': ('-top',), 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',)}[side or '']
+    return ';'.join(f'border{s}-width:{width}' for s in sides)
+
+
+def _u_border_color(m):
+    color = _color(m.group(1))
+    return f'border-color:{color}' if color else None
+
+
+def _u_divide_width(m):
+    axis, width = m.groups()
+    width = f'{width or 1}px'
+    if axis == 'y':
+        return f'border-top-width:{width};border-bottom-width:0', CHILD_SELECTOR
+    return f'border-left-width:{width};border-right-width:0', CHILD_SELECTOR
+
+
+def _u_divide_color(m):
+    color = _color(m.group(1))
+    return (f'border-color:{color}', CHILD_SELECTOR) if color else None
+
+
+def _u_rounded(m):
+    value = RADII.get(m.group(1) or '')
+    return f'border-radius:{value}' if value else None
+
+
+def _u_shadow(m):
+    value = BOX_SHADOWS.get(m.group(1) or '')
+    return f'--tw-shadow:{value};box-shadow:{BOX_SHADOW}' if value else None
+
+
+def _u_ring_width(m):
+    width = f'{m.group(1) or 3}px'
+    return (
+        f'--tw-ring-shadow:0 0 0 {width} var(--tw-ring-color,rgb(59 130 246 / .5));'
+        f'box-shadow:{BOX_SHADOW}'
+    )
+
+
+def _u_ring_color(m):
+    color = _color(m.group(1))
+    return f'--tw-ring-color:{color}' if color else None
+
+
+def _u_opacity(m):
+    return f'opacity:{int(m.group(1)) / 100:g}'
+
+
+def _u_aspect(m):
+    return f'aspect-ratio:{m.group(1)} / {m.group(2)}'
+
+
+# (patrón, generador) en el orden de emisión: las utilidades más generales
+# primero para que las específicas (px después de p) ganen en la cascada
+DYNAMIC_UTILITIES = [
+    (r'(-?)(inset|inset-x|inset-y|top|right|bottom|left)-(.+)', _u_inset),
+    (r'(-?)z-(\d+)', _u_z),
+    (r'col-span-(\d+)', _u_col_span),
+    (r'(-?)m()-(.+)', lambda m: _box_property('margin', m)),
+    (r'(-?)m([xy])-(.+)', lambda m: _box_property('margin', m)),
+    (r'(-?)m([trbl])-(.+)', lambda m: _box_property('margin', m)),
+    (r'aspect-\[(\d+)/(\d+)\]', _u_aspect),
+    (r'(w|h|min-w|min-h|max-w|max-h)-(.+)', _u_size),
+    (r'(-?)translate-([xy])-(.+)', _u_translate),
+    (r'scale-(\d+)', _u_scale),
+    (r'grid-cols-(\d+)', _u_grid_cols),
+    (r'gap(-[xy])?-(.+)', _u_gap),
+    (r'space-([xy])-(.+)', _u_space),
+    (r'divide-([xy])(?:-(\d+))?', _u_divide_width),
+    (r'divide-(.+)', _u_divide_color),
+    (r'rounded(?:-(.+))?', _u_rounded),
+    (r'border(?:-([xytrbl]))?(?:-(\d+))?', _u_border_width),
+    (r'border-(.+)', _u_border_color),
+    (r'bg-gradient-to-(\w+)', _u_gradient),
+    (r'bg-(.+)', _u_bg),
+    (r'from-(.+)', _u_from),
+    (r'via-(.+)', _u_via),
+    (r'to-(.+)', _u_to),
+    (r'(-?)p()-(.+)', lambda m: _box_property('padding', m)),
+    (r'(-?)p([xy])-(.+)', lambda m: _box_property('padding', m)),
+    (r'(-?)p([trbl])-(.+)', lambda m: _box_property('padding', m)),
+    (r'font-(.+)', _u_font),
+    (r'text-(.+)', _u_text),
+    (r'leading-(.+)', _u_leading),
+    (r'tracking-(.+)', _u_tracking),
+    (r'opacity-(\d+)', _u_opacity),
+    (r'shadow(?:-(.+))?', _u_shadow),
+    (r'ring(?:-(\d+))?', _u_ring_width),
+    (r'ring-(.+)', _u_ring_color),
+]
+DYNAMIC_UTILITIES = [(re.compile(pattern), handler) for pattern, handler in DYNAMIC_UTILITIES]
+
+
+def resolve_utility(name):
+    """Retorna (orden, declaraciones, sufijo de selector) o None"""
+    if name in STATIC_UTILITIES:
+        return (0, list(STATIC_UTILITIES).index(name)), STATIC_UTILITIES[name], ''
+    for index, (pattern, handler) in enumerate(DYNAMIC_UTILITIES, start=1):
+        m = pattern.fullmatch(name)
+        if not m:
+            continue
+        result = handler(m)
+        if result:
+            declarations, child = result if isinstance(result, tuple) else (result, '')
+            return (index, 0), declarations, child
+    return None
+
+
+# ========== VARIANTES ==========
+# Orden de emisión de las pseudo-clases (las de estado van después de la base)
+STATE_VARIANTS = {'hover': ':hover', 'focus': ':focus', 'focus-within': ':focus-within', 'active': ':active'}
+
+
+def escape_class(name):
+    """Escapa un nombre de clase para usarlo en un selector CSS"""
+    return ''.join(c if c.isalnum() or c in '-_' else '\\' + c for c in name)
+
+
+def _split_variants(candidate):
+    """'md:hover:bg-x' -> (['md', 'hover'], 'bg-x') respetando los [...]"""
+    parts, depth, current = [], 0, ''
+    for char in candidate:
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        if char == ':' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return parts[:-1], parts[-1]
+
+
+def compile_class(candidate):
+    """Retorna (clave de orden, media query, regla CSS) o None si no es una utilidad"""
+    variants, utility = _split_variants(candidate)
+    resolved = resolve_utility(utility)
+    if resolved is None:
+        return None
+    order, declarations, child = resolved
+
+    selector = '.' + escape_class(candidate)
+    prefix, media, state_order = '', '', 0
+    for variant in variants:
+        if variant in SCREENS:
+            if media:
+                return None
+            media = variant
+        elif variant in STATE_VARIANTS:
+            selector += STATE_VARIANTS[variant]
+            state_order = max(state_order, list(STATE_VARIANTS).index(variant) + 1)
+        elif variant == 'group-hover':
+            prefix += '.group:hover '
+            state_order = max(state_order, 1)
+        elif variant == 'dark':
+            prefix = '.dark ' + prefix
+            state_order += 10
+        else:
+            return None
+
+    rule = f'{prefix}{selector}{child}{{{declarations}}}'
+    return (state_order, order, candidate), media, rule
+
+
+# ========== HOJA DE ESTILOS ==========
+def preflight():
+    """Reset base equivalente al preflight de Tailwind"""
+    return (
+        '*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}'
+        f'html{{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:{FONT_FAMILIES["sans"]};'
+        '-webkit-tap-highlight-color:transparent}'
+        'body{margin:0;line-height:inherit}'
+        'hr{height:0;color:inherit;border-top-width:1px}'
+        'h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}'
+        'a{color:inherit;text-decoration:inherit}'
+        'b,strong{font-weight:bolder}'
+        f'code,kbd,samp,pre{{font-family:{FONT_FAMILIES["mono"]};font-size:1em}}'
+        'small{font-size:80%}'
+        'table{text-indent:0;border-color:inherit;border-collapse:collapse}'
+        'button,input,optgroup,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;'
+        'line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}'
+        'button,select{text-transform:none}'
+        'button,[type=button],[type=reset],[type=submit]{-webkit-appearance:button;background-color:transparent;background-image:none}'
+        ':-moz-focusring{outline:auto}'
+        '[type=search]{-webkit-appearance:textfield;outline-offset:-2px}'
+        '::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}'
+        'summary{display:list-item}'
+        'blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}'
+        'fieldset{margin:0;padding:0}legend{padding:0}'
+        'ol,ul,menu{list-style:none;margin:0;padding:0}'
+        'textarea{resize:vertical}'
+        'input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}'
+        'button,[role=button]{cursor:pointer}'
+        ':disabled{cursor:default}'
+        'img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}'
+        'img,video{max-width:100%;height:auto}'
+        '[hidden]{display:none}'
+    )
+
+
+def theme_variables():
+    """Colores del tema por defecto como variables CSS"""
+    variables = ';'.join(
+        f'--color-{name}-{shade}:{value}'
+        for name, shades in THEME_COLORS.items()
+        for shade, value in shades.items()
+    )
+    return f':root{{{variables}}}'
+
+
+def collect_candidates(base_dir=None):
+    """Todos los posibles nombres de clase de las plantillas"""
+    base_dir = Path(base_dir or settings.BASE_DIR)
+    candidates = set()
+    for pattern in CONTENT_GLOBS:
+        for path in base_dir.glob(pattern):
+            candidates.update(CANDIDATE_RE.findall(path.read_text(encoding='utf-8')))
+    return candidates
+
+
+def _class_names(text):
+    for match in CLASS_ATTR_RE.finditer(text):
+        yield from TEMPLATE_TAG_RE.sub(' ', match.group(2)).split()
+    for match in CLASS_LIST_RE.finditer(text):
+        yield from re.findall(r'''["'`]([^"'`]+)["'`]''', match.group(1))
+
+
+def unresolved_classes(base_dir=None):
+    """Clases con forma de utilitaria que el generador no conoce
+
+    Retorna {clase: [archivos]}. Se ignoran los íconos y las clases definidas
+    en STYLESHEETS; sin este aviso una clase desconocida queda sin estilo.
+    """
+    base_dir = Path(base_dir or settings.BASE_DIR)
+    defined = set()
+    for name in STYLESHEETS:
+        path = base_dir / name
+        if path.is_file():
+            defined.update(re.findall(r'\.(-?[A-Za-z_][\w-]*)', path.read_text(encoding='utf-8')))
+
+    unresolved = {}
+    for pattern in CONTENT_GLOBS:
+        for path in sorted(base_dir.glob(pattern)):
+            for name in _class_names(path.read_text(encoding='utf-8')):
+                if ('-' not in name and ':' not in name) or name in defined:
+                    continue
+                if name.startswith(IGNORED_CLASS_PREFIXES) or compile_class(name):
+                    continue
+                files = unresolved.setdefault(name, [])
+                relative = str(path.relative_to(base_dir))
+                if relative not in files:
+                    files.append(relative)
+    return dict(sorted(unresolved.items()))
+
+
+def build_stylesheet(candidates):
+    """Genera la hoja de estilos mínima para las clases dadas
+
+    Retorna (css, clases generadas).
+    """
+    compiled = [rule for rule in map(compile_class, candidates) if rule]
+    compiled.sort(key=lambda item: item[0])
+
+    base = [rule for _, media, rule in compiled if not media]
+    blocks = [
+        f'@media (min-width:{width}){{{"".join(rule for _, media, rule in compiled if media == screen)}}}'
+        for screen, width in SCREENS.items()
+        if any(media == screen for _, media, _ in compiled)
+    ]
+    css = '\n'.join([
+        '/* Generado por manage.py build_css: no editar a mano */',
+        theme_variables(),
+        preflight(),
+        '\n'.join(base),
+        *blocks,
+    ])
+    return css + '\n', sorted(key[2] for key, _, _ in compiled)
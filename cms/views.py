@@ -1,24 +1,44 @@
 """
 Vistas para AC Technology CMS
 """
+import time
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import login, logout
 from django.contrib import messages
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import View, ListView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.views.decorators.http import condition
+from django.views.static import serve
+from django.conf import settings
 from django.urls import reverse_lazy
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.db import DatabaseError, OperationalError
+from django.utils.http import http_date, url_has_allowed_host_and_scheme
+from django.template.loader import get_template
 
 from .models import (
     User, SiteConfig, HeroSection, Service, Partner,
-    Showroom, Project, ContactInfo, SEOConfig
+    Showroom, Project, ContactInfo, SEOConfig, HomepageSnapshot, Counter
 )
 from .forms import (
     CustomUserCreationForm, SiteConfigForm, HeroSectionForm,
     ServiceForm, PartnerForm, ShowroomForm, ProjectForm, ContactInfoForm,
     SEOConfigForm
 )
+from .bulk import bulk_actions, run_bulk_action
+from .ordering import ReorderError, move
+from .pagination import keyset_page
+from .seo import render_seo_head
+from .storage import IMMUTABLE_CACHE_CONTROL, is_immutable_name
+from .cache import (
+    INDEX_PAGE_TIMEOUT, STALE_IF_ERROR, get_index_page, set_index_page, get_content_etag, content_etag,
+    get_build_id,
+    get_last_modified, get_model_versions, get_content_version,
+    get_stale_index_page, acquire_index_lock, release_index_lock,
+    get_recent
+)
 
 
 # ========== MIXINS Y DECORADORES ==========
@@ -34,33 +54,222 @@ class AdminRequiredMixin(UserPassesTestMixin):
                (self.request.user.is_staff or self.request.user.role == 'admin')
 
 
+class KeysetListMixin:
+    """ListView paginado por cursor, con orden por columna y búsqueda (?q=)"""
+    sort_fields = ()
+    default_sort = 'pk'
+    search_fields = ()
+    # True si el modelo tiene total mantenido en la tabla Counter
+    counted = False
+    # Arrastrar y soltar solo con la lista completa ordenada por 'order'
+    reorder_url = None
+    bulk_url = None
+
+    def get_context_data(self, **kwargs):
+        page = keyset_page(
+            self.request, self.object_list,
+            sort_fields=self.sort_fields,
+            default_sort=self.default_sort,
+            search_fields=self.search_fields,
+            counted=self.counted,
+        )
+        context = super().get_context_data(object_list=page, **kwargs)
+        context['page'] = page
+        if page.sort == 'order' and not page.query:
+            context['reorder_url'] = self.reorder_url
+        if self.bulk_url:
+            context.update(bulk_url=self.bulk_url, bulk_actions=bulk_actions(self.model))
+        return context
+
+
 # ========== VISTA PRINCIPAL (PÚBLICA) ==========
+def index_etag(request):
+    """ETag de la portada según la generación de contenido (sin consultas)"""
+    return get_content_etag()
+
+
+def index_last_modified(request):
+    """Last-Modified de la portada: fecha del último snapshot publicado"""
+    last_modified = get_last_modified()
+    if last_modified is None:
+        try:
+            last_modified = HomepageSnapshot.load().last_modified
+        except DatabaseError:
+            # La vista decide si sirve la última portada cacheada
+            return None
+    return last_modified
+
+
+# Partes de la portada en orden
+INDEX_TEMPLATES = (
+    'cms/index/head.html',
+    'cms/index/header.html',
+    'cms/index/hero.html',
+    'cms/index/services.html',
+    'cms/index/partners.html',
+    'cms/index/showroom.html',
+    'cms/index/projects.html',
+    'cms/index/contact.html',
+    'cms/index/footer.html',
+)
+
+# Fragmentos cacheados de la portada ({% cache %}) y los modelos que lee cada
+# uno: editar una marca solo vuelve a renderizar la sección de marcas
+INDEX_FRAGMENTS = {
+    'hero': ('cms.herosection', 'cms.siteconfig'),
+    'services': ('cms.service',),
+    'partners': ('cms.partner',),
+    'showroom': ('cms.showroom',),
+    'projects': ('cms.project',),
+    'contact': ('cms.contactinfo',),
+}
+
+
+def fragment_versions():
+    """Versión de cada fragmento: el build más las versiones de sus modelos"""
+    versions = get_model_versions({label for labels in INDEX_FRAGMENTS.values() for label in labels})
+    return {
+        name: '.'.join([get_build_id(), *(format(versions[label], 'x') for label in labels)])
+        for name, labels in INDEX_FRAGMENTS.items()
+    }
+
+
+@condition(etag_func=index_etag, last_modified_func=index_last_modified)
 def index(request):
     """Vista principal del sitio web (sin login requerido)"""
-    context = {
-        'site_config': SiteConfig.load(),
-        'hero': HeroSection.load(),
-        'services': Service.objects.filter(active=True),
-        'partners': Partner.objects.filter(active=True),
-        'showroom': Showroom.load(),
-        'projects': Project.objects.filter(active=True)[:3],  # Mostrar solo 3
-        'contact': ContactInfo.load(),
-        'seo': SEOConfig.load(),  # Agregar configuración SEO
-    }
-    return render(request, 'cms/index.html', context)
+    # La portada solo cambia cuando se edita contenido: servirla desde caché
+    content = get_index_page(request)
+    if content is not None:
+        return HttpResponse(content)
+
+    locked = acquire_index_lock(request)
+    if not locked:
+        # Otro worker ya la está renderizando: servir la generación anterior
+        # en lugar de sumar otra consulta a la base de datos
+        stale = get_stale_index_page(request)
+        if stale is not None:
+            return stale_index_response(stale)
+
+    version = get_content_version()
+    try:
+        if getattr(settings, 'CMS_STREAM_INDEX', True):
+            # Sin caché: enviar el <head> apenas esté listo para que el navegador
+            # empiece a descargar CSS, fuentes y la imagen del hero
+            response = StreamingHttpResponse(IndexStream(request, version, locked))
+            locked = False  # IndexStream lo libera al cerrarse la respuesta
+            return response
+        # Toda la portada se renderiza antes de crear la respuesta: un error
+        # en cualquier sección llega como 500, no como un 200 cortado
+        content = render_index(request)
+        set_index_page(request, content, version)
+    except DatabaseError:
+        # Base de datos bloqueada o caída: la última portada antes que un 500
+        stale = get_stale_index_page(request, STALE_IF_ERROR)
+        if stale is None:
+            raise
+        return stale_index_response(stale)
+    finally:
+        if locked:
+            release_index_lock(request)
+    return HttpResponse(content)
+
+
+class IndexStream:
+    """Portada por partes: el <head> ya renderizado y después cada sección
+
+    El snapshot se carga y el <head> se renderiza al crearla, antes de la
+    respuesta: esos errores siguen siendo un 500 (o la portada anterior). Si
+    falla una sección posterior la conexión se corta y no se cachea nada.
+    Las plantillas no deben tocar la sesión ni el token CSRF, cuyas cookies
+    ya no se pueden enviar.
+    """
+
+    def __init__(self, request, version, locked=False):
+        self.request = request
+        self.version = version
+        self.locked = locked
+        self.parts = iter_index(request)
+        self.head = next(self.parts)
+
+    def __iter__(self):
+        chunks = [self.head]
+        yield self.head
+        for chunk in self.parts:
+            chunks.append(chunk)
+            yield chunk
+        # Solo se cachea una portada enviada completa
+        set_index_page(self.request, ''.join(chunks), self.version)
+
+    def close(self):
+        # StreamingHttpResponse lo llama al terminar, aunque el cliente se
+        # haya desconectado antes de leer nada
+        if self.locked:
+            self.locked = False
+            release_index_lock(self.request)
+
+
+def stale_index_response(stale):
+    """Portada de una generación anterior con sus propios validadores"""
+    response = HttpResponse(stale['content'])
+    # Sin estos, condition() pondría los de la generación actual y el
+    # navegador guardaría la versión anterior como si fuera la nueva
+    response['ETag'] = '"%s"' % content_etag(stale['version'])
+    if stale['last_modified']:
+        response['Last-Modified'] = http_date(stale['last_modified'].timestamp())
+    if 'rendered_at' in stale:
+        response['Age'] = max(0, int(time.time() - stale['rendered_at']))
+    response['Cache-Control'] = 'no-cache'
+    response['X-Cache'] = 'STALE'
+    return response
+
+
+def iter_index(request):
+    """Renderiza la portada por partes, en orden de envío
+
+    El snapshot y las plantillas se cargan antes de retornar; cada parte se
+    renderiza al pedirla.
+    """
+    # Las versiones se leen antes que el snapshot (como version en index):
+    # si se publica en medio, el fragmento viejo queda bajo la versión vieja
+    versions = fragment_versions()
+    # Todo el contenido sale del snapshot publicado (una sola fila)
+    context = HomepageSnapshot.load().get_context()
+    context.update(
+        fragment_versions=versions,
+        fragment_timeout=INDEX_PAGE_TIMEOUT,
+        seo_head=render_seo_head(context['seo'], context['site_config'], context['contact'], request),
+    )
+    templates = [get_template(name) for name in INDEX_TEMPLATES]
+    return (template.render(context, request) for template in templates)
+
+
+def render_index(request):
+    """Renderiza la portada completa a partir del snapshot publicado"""
+    return ''.join(iter_index(request))
+
+
+# ========== ARCHIVOS MEDIA (DESARROLLO) ==========
+def serve_media(request, path):
+    """Sirve /media/ en desarrollo con caché inmutable para nombres con hash"""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_immutable_name(path):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
 
 
 # ========== DASHBOARD (REQUIERE LOGIN) ==========
 @login_required(login_url='login')
 def dashboard(request):
     """Dashboard principal del panel administrativo"""
+    # Totales mantenidos por señales: una consulta en lugar de cuatro COUNT(*)
+    totals = Counter.totals((Service, Partner, Project, User))
     context = {
-        'total_services': Service.objects.count(),
-        'total_partners': Partner.objects.count(),
-        'total_projects': Project.objects.count(),
-        'total_users': User.objects.count(),
-        'recent_projects': Project.objects.all()[:5],
-        'recent_services': Service.objects.all()[:5],
+        'total_services': totals['cms.service'],
+        'total_partners': totals['cms.partner'],
+        'total_projects': totals['cms.project'],
+        'total_users': totals['cms.user'],
+        'recent_projects': get_recent(Project),
+        'recent_services': get_recent(Service),
     }
     return render(request, 'cms/dashboard/dashboard.html', context)
 
@@ -69,8 +278,14 @@ def dashboard(request):
 @user_passes_test(admin_required, login_url='dashboard')
 def user_list(request):
     """Lista de usuarios"""
-    users = User.objects.all().order_by('-date_joined')
-    return render(request, 'cms/dashboard/users/list.html', {'users': users})
+    page = keyset_page(
+        request, User.objects.all(),
+        sort_fields=('username', 'email', 'role', 'is_active', 'date_joined'),
+        default_sort='-date_joined',
+        search_fields=('username', 'email', 'first_name', 'last_name'),
+        counted=True,
+    )
+    return render(request, 'cms/dashboard/users/list.html', {'users': page, 'page': page})
 
 
 @user_passes_test(admin_required, login_url='dashboard')
@@ -175,13 +390,73 @@ def hero_edit(request):
     })
 
 
+# ========== ORDEN (ARRASTRAR Y SOLTAR) ==========
+class ReorderView(LoginRequiredMixin, View):
+    """Mueve una fila entre dos vecinas (POST pk, previous y/o next)"""
+    model = None
+    login_url = 'login'
+    http_method_names = ['post']
+
+    def post(self, request):
+        try:
+            pk = int(request.POST['pk'])
+            previous, following = (
+                int(request.POST[name]) if request.POST.get(name) else None
+                for name in ('previous', 'next')
+            )
+            order = move(self.model, pk, previous, following)
+        except (KeyError, ValueError, ReorderError):
+            # Mensaje fijo: el texto de la excepción puede repetir la entrada
+            return JsonResponse({'error': 'Movimiento no válido'}, status=400)
+        except self.model.DoesNotExist:
+            return JsonResponse({'error': 'La fila ya no existe'}, status=404)
+        except OperationalError:
+            # Otro editor escribió al mismo tiempo (SQLite): recargar y reintentar
+            return JsonResponse({'error': 'La lista cambió, recarga la página'}, status=409)
+        return JsonResponse({'pk': pk, 'order': order})
+
+
+class BulkActionView(LoginRequiredMixin, View):
+    """Aplica una acción a las filas marcadas de una lista (POST action y pk)"""
+    model = None
+    success_url = None
+    login_url = 'login'
+    http_method_names = ['post']
+
+    def post(self, request):
+        next_url = request.POST.get('next', '')
+        if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+            next_url = self.success_url
+        action = request.POST.get('action', '')
+        try:
+            pks = [int(pk) for pk in request.POST.getlist('pk')]
+            count = run_bulk_action(self.model, action, pks)
+        except ValueError:
+            messages.error(request, 'Acción no válida.')
+            return redirect(next_url)
+
+        if count:
+            opts = self.model._meta
+            noun = opts.verbose_name if count == 1 else opts.verbose_name_plural
+            messages.success(request, f'Acción «{bulk_actions(self.model)[action]}» aplicada a {count} {noun.lower()}.')
+        else:
+            messages.info(request, 'No se seleccionó ninguna fila.')
+        return redirect(next_url)
+
+
 # ========== SERVICIOS ==========
-class ServiceListView(LoginRequiredMixin, ListView):
+class ServiceListView(LoginRequiredMixin, KeysetListMixin, ListView):
     """Lista de servicios"""
     model = Service
     template_name = 'cms/dashboard/services/list.html'
     context_object_name = 'services'
     login_url = 'login'
+    sort_fields = ('title', 'order', 'active', 'created_at')
+    default_sort = 'order'
+    search_fields = ('title',)
+    counted = True
+    reorder_url = reverse_lazy('service_reorder')
+    bulk_url = reverse_lazy('service_bulk')
 
 
 class ServiceCreateView(LoginRequiredMixin, CreateView):
@@ -223,12 +498,18 @@ class ServiceDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # ========== MARCAS/PARTNERS ==========
-class PartnerListView(LoginRequiredMixin, ListView):
+class PartnerListView(LoginRequiredMixin, KeysetListMixin, ListView):
     """Lista de marcas"""
     model = Partner
     template_name = 'cms/dashboard/partners/list.html'
     context_object_name = 'partners'
     login_url = 'login'
+    sort_fields = ('name', 'order', 'active', 'created_at')
+    default_sort = 'order'
+    search_fields = ('name',)
+    counted = True
+    reorder_url = reverse_lazy('partner_reorder')
+    bulk_url = reverse_lazy('partner_bulk')
 
 
 class PartnerCreateView(LoginRequiredMixin, CreateView):
@@ -270,12 +551,18 @@ class PartnerDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # ========== PROYECTOS ==========
-class ProjectListView(LoginRequiredMixin, ListView):
+class ProjectListView(LoginRequiredMixin, KeysetListMixin, ListView):
     """Lista de proyectos"""
     model = Project
     template_name = 'cms/dashboard/projects/list.html'
     context_object_name = 'projects'
     login_url = 'login'
+    sort_fields = ('title', 'order', 'active', 'created_at')
+    default_sort = 'order'
+    search_fields = ('title',)
+    counted = True
+    reorder_url = reverse_lazy('project_reorder')
+    bulk_url = reverse_lazy('project_bulk')
 
 
 class ProjectCreateView(LoginRequiredMixin, CreateView):